@@ -23,98 +23,26 @@ bl_info = {
     "blender": (2, 79, 0),
     "location": "View3D > Add > Mesh",
     "description": "Add an elliptic torus with the cross-section correctly following the ellipse",
-    "warning": "Some functionality depends on SciPy, however, this functionally is gracefully disabled if SciPy is unavailable.",
+    "warning": "",
     "wiki_url": "https://github.com/DuaneDibbley/DDShapes/wiki/DD-Shapes",
     "category": "Add Mesh"
 }
 
-import sys
 import bpy
 from bpy.types import Operator
-from bpy.props import IntProperty, FloatProperty, FloatVectorProperty, EnumProperty
-from math import cos, sin, pi, fabs, sqrt, atan2
-from mathutils import Vector, Matrix
-from numpy import sinc
+from bpy.props import IntProperty, FloatProperty, FloatVectorProperty, EnumProperty, StringProperty, BoolProperty
+from math import pi
+import threading
+from .Geometry import Profiling
+from .Geometry.Shapes import SHAPE_DEFAULTS
+from .Regenerate import getOperatorParameters, splitSurfaceOptions
+from .ShapeObjects import getArrayPatterns, createShapeObjects
 
-try:
-    from scipy.integrate import quad
-    from scipy.optimize import fsolve
-    from scipy.special import hyp2f1
-except ImportError:
-    pass
-
-#Function to integrate to get the arc length
-def arcFunc(param, major, minor):
-    return sqrt((-major*sin(param))**2+(minor*cos(param))**2)
-
-#Integrate arcFunc
-def arcLength(param, major, minor, arc_length):
-    return quad(arcFunc, a=0.0, b=param, args=(major, minor))[0]-arc_length
-
-#For a set of points on the ellipse, calculate the difference
-#lengths of its two connecting edges
-def distDiffs(params, major, minor):
-    steps = len(params)
-    diff_list = []
-    for step in range(steps):
-        x_coords = [major*cos(params[step]), major*cos(params[(step+1)%steps]), major*cos(params[(step+2)%steps])]
-        y_coords = [minor*sin(params[step]), minor*sin(params[(step+1)%steps]), minor*sin(params[(step+2)%steps])]
-        dist1 = sqrt((x_coords[0]-x_coords[1])**2+(y_coords[0]-y_coords[1])**2)
-        dist2 = sqrt((x_coords[2]-x_coords[1])**2+(y_coords[2]-y_coords[1])**2)
-        diff_list.append(fabs(dist2-dist1))
-    return diff_list
-
-def getParamAndNormal(major, minor, steps, spacing_type):
-    param_list = []
-    normal_list = []
-    if spacing_type == "spacing.dist":
-        params = []
-        for step in range(steps):
-            params.append(2*step*pi/steps)
-        param_list = fsolve(distDiffs, x0=params, args=(major, minor))
-        for step in range(steps):
-            normal_list.append(atan2(major*sin(param_list[step]), minor*cos(param_list[step])))
-    else:
-        for step in range(steps):
-            #Both the parameter and the normal are always 0 at the first step
-            if step == 0:
-                param_list.append(0.0)
-                normal_list.append(0.0)
-            #All the algorithms yield the same result for circles,
-            #thus we ignore spacing_type if major and minor are equal
-            elif major == minor or spacing_type == "spacing.area":
-                param_list.append(2*pi*step/steps)
-                normal_list.append(atan2(major*sin(2*pi*step/steps), minor*cos(2*pi*step/steps)))
-            elif spacing_type == "spacing.normal":
-                normal_list.append(2*pi*step/steps)
-                param_list.append(atan2(minor*sin(2*pi*step/steps), major*cos(2*pi*step/steps)))
-            elif spacing_type == "spacing.radius":
-                param_list.append(atan2(major*sin(2*pi*step/steps), minor*cos(2*pi*step/steps)))
-                normal_list.append(atan2(major*sin(param_list[step]), minor*cos(param_list[step])))
-            elif spacing_type == "spacing.arc":
-                circumference = 2*pi*max(major, minor)*hyp2f1(-.5, .5, 1, 1-(min(major, minor)/max(major, minor))**2)
-                arc_length = circumference*step/steps
-                param_list.append(fsolve(arcLength, [0.0], args=(major, minor, arc_length))[0])
-                normal_list.append(atan2(major*sin(param_list[step]), minor*cos(param_list[step])))
-
-    return param_list, normal_list
-
-def getTwistAngle(twist, amplitude, twist_type, v, step):
-    if twist_type == "twist.sine":
-        twist_angle = amplitude*sin(twist*2*v*pi/step)
-    elif twist_type == "twist.sincn":
-        twist_angle = amplitude*sinc(twist*(2*v/step-1.0))
-    elif twist_type =="twist.sinc":
-        twist_angle = amplitude*sinc(twist*(2*v/step-1.0)/pi)
-    else:
-        twist_angle = amplitude*twist*v/step
-    return twist_angle
-
-class MESH_OT_elliptic_torus_add(Operator):
-    bl_idname = "mesh.elliptic_torus_add"
-    bl_label = "Add Elliptic Torus"
-    bl_options = {"REGISTER", "UNDO", "PRESET"}
+TORUS_DEFAULTS = SHAPE_DEFAULTS["elliptic_torus"]
 
+#Properties of the elliptic torus operators. They are kept in a plain class, since Blender only
+#collects the properties of the base classes of an operator that aren't registered themselves.
+class EllipticTorusProperties:
     #Callbacks for enum properties
     #Spacing types
     def getSpacingTypes(self, context):
@@ -128,15 +56,15 @@ class MESH_OT_elliptic_torus_add(Operator):
         spacing_types.append(("spacing.radius",
                               "Equiangular Radius",
                               "Space between points equiangularly by the direction of the radii"))
-
-        #Functions requiring SciPy aren't added to the list unless SciPy has been properly loaded
-        if "scipy" in sys.modules:
-            spacing_types.append(("spacing.dist",
-                                  "Equal Edge Length",
-                                  "Place points such that all edges are of equal length"))
-            spacing_types.append(("spacing.arc",
-                                  "Equal Arc Length",
-                                  "Place points at equal arc distance along the circumference of ellipse"))
+        spacing_types.append(("spacing.dist",
+                              "Equal Edge Length",
+                              "Place points such that all edges are of equal length"))
+        spacing_types.append(("spacing.arc",
+                              "Equal Arc Length",
+                              "Place points at equal arc distance along the circumference of ellipse"))
+        spacing_types.append(("spacing.adaptive",
+                              "Adaptive",
+                              "Place as few points as needed to keep the edges within the tolerance of the ellipse, ignoring the number of segments"))
 
         return spacing_types
 
@@ -155,6 +83,9 @@ class MESH_OT_elliptic_torus_add(Operator):
         twist_types.append(("twist.sincn",
                             "Cardinal Sine (normalized)",
                             "Twist back and forth like a sinc function"))
+        twist_types.append(("twist.curve",
+                            "Sampled Curve",
+                            "Twist along a curve interpolated between the twist curve samples"))
         return twist_types
 
     #Thickness methods
@@ -171,7 +102,7 @@ class MESH_OT_elliptic_torus_add(Operator):
     #Property definitions
     ring_axes = FloatVectorProperty(name="Ring Semi-Axes",
                                     description="The semi-axes of the ring",
-                                    default=((3+sqrt(5))/2, (1+sqrt(5))/2),
+                                    default=TORUS_DEFAULTS["ring_axes"],
                                     min=0.0,
                                     max=100.0,
                                     step=1,
@@ -181,15 +112,23 @@ class MESH_OT_elliptic_torus_add(Operator):
                                     size=2)
     vstep = IntProperty(name="Ring Segments",
                         description="Number of segments for the ellipse",
-                        default=48,
+                        default=TORUS_DEFAULTS["vstep"],
                         min=4,
                         max=1024)
     ring_spacing_type = EnumProperty(items=getSpacingTypes,
                                      name="Ring Spacing",
                                      description="Define how to calculate the space between the points on the ring")
+    ring_tolerance = FloatProperty(name="Ring Tolerance",
+                                   description="Largest distance between the edges and the ellipse of the ring, for the adaptive spacing",
+                                   default=TORUS_DEFAULTS["ring_tolerance"],
+                                   min=0.00001,
+                                   soft_max=1.0,
+                                   step=1,
+                                   precision=5,
+                                   subtype="DISTANCE")
     cross_axes = FloatVectorProperty(name="Cross-Section Semi-Axes",
                                      description="The semi-axes of the cross-section",
-                                     default=((sqrt(5)-1)/2, (3-sqrt(5))/2),
+                                     default=TORUS_DEFAULTS["cross_axes"],
                                      min=0.0,
                                      max=100.0,
                                      step=1,
@@ -199,20 +138,28 @@ class MESH_OT_elliptic_torus_add(Operator):
                                      size=2)
     ustep = IntProperty(name="Cross-Section Segments",
                         description="Number of segments for the cross-section",
-                        default=12,
+                        default=TORUS_DEFAULTS["ustep"],
                         min=4,
                         max=1024)
     cross_spacing_type = EnumProperty(items=getSpacingTypes,
                                       name="Cross-Section Spacing",
                                       description="Define how to calculate the space between the points on the cross-section")
+    cross_tolerance = FloatProperty(name="Cross-Section Tolerance",
+                                    description="Largest distance between the edges and the ellipse of the cross-section, for the adaptive spacing",
+                                    default=TORUS_DEFAULTS["cross_tolerance"],
+                                    min=0.00001,
+                                    soft_max=1.0,
+                                    step=1,
+                                    precision=5,
+                                    subtype="DISTANCE")
     cross_twist = IntProperty(name="Cross-Section Twists",
                               description="Number of twists of the cross-section",
-                              default=0,
+                              default=TORUS_DEFAULTS["cross_twist"],
                               min=0,
                               max=256)
     cross_twist_amplitude = FloatProperty(name="Twist Amplitude",
                                           description="The angle each twist equals",
-                                          default=pi,
+                                          default=TORUS_DEFAULTS["cross_twist_amplitude"],
                                           min=0,
                                           soft_max=2*pi,
                                           step=10,
@@ -221,9 +168,12 @@ class MESH_OT_elliptic_torus_add(Operator):
     cross_twist_type = EnumProperty(items=getTwistTypes,
                                     name="Twist Type",
                                     description="Define how the twisting is done")
+    cross_twist_samples = StringProperty(name="Twist Curve",
+                                         description="Twist angles over one twist, as fractions of the amplitude, for the sampled curve twist type",
+                                         default=TORUS_DEFAULTS["cross_twist_samples"])
     cross_rotation = FloatProperty(name="Cross-Section Initial Twist",
                                    description="Initial twist of the cross-section",
-                                   default=0.0,
+                                   default=TORUS_DEFAULTS["cross_rotation"],
                                    min=-pi/2.0,
                                    max=pi/2.0,
                                    step=10,
@@ -232,98 +182,241 @@ class MESH_OT_elliptic_torus_add(Operator):
     tube_thickness_method = EnumProperty(items=getThicknessMethods,
                                          name="Tube Thickness Method",
                                          description="How to calculate the tube thickness")
+    lod_factors = StringProperty(name="Levels of Detail",
+                                 description="Factors to divide the segment counts by, one mesh per level, grouped under an empty. Leave empty for a single mesh",
+                                 default="")
+    use_normals = BoolProperty(name="Analytic Normals",
+                               description="Shade the mesh smooth with custom split normals calculated from the shape",
+                               default=False)
+    use_uvs = BoolProperty(name="UV Map",
+                           description="Add a UV map following the segments of the shape",
+                           default=False)
+    array_count = IntProperty(name="Array Count",
+                              description="Number of copies of the shape, all sharing the same mesh",
+                              default=1,
+                              min=1,
+                              soft_max=1000,
+                              max=100000)
+    array_pattern = EnumProperty(items=getArrayPatterns,
+                                 name="Array Pattern",
+                                 description="How to place the copies of the shape")
+    array_spacing = FloatProperty(name="Array Spacing",
+                                  description="Distance between neighbouring copies of the shape",
+                                  default=8.0,
+                                  min=0.0,
+                                  soft_max=100.0,
+                                  step=10,
+                                  precision=2,
+                                  subtype="DISTANCE")
+    array_seed = IntProperty(name="Array Seed",
+                             description="Seed of the random array pattern",
+                             default=0,
+                             min=0)
 
-    #Create the mesh
+#Creating the elliptic torus from the properties, shared by the elliptic torus operators
+class EllipticTorusGenerator:
+    #Create the mesh, timing each stage if profiling is enabled
     def execute(self, context):
+        profile = Profiling.snapshot() if Profiling.enabled else None
+        with Profiling.stage("EllipticTorus.execute"):
+            result = self.generate(context)
+        if profile is not None:
+            self.report({"INFO"}, Profiling.formatReport(profile))
+        return result
 
-        #Initial values for variables
-        cross_base_vertices = []
-        cross_transforms = []
-        ring_vertices = []
-        vertices = []
-        faces = []
-        cross_params, cross_normals = getParamAndNormal(self.cross_axes[0],
-                                                        self.cross_axes[1],
-                                                        self.ustep,
-                                                        self.cross_spacing_type)
-        ring_params, ring_normals = getParamAndNormal(self.ring_axes[0],
-                                                      self.ring_axes[1],
-                                                      self.vstep,
-                                                      self.ring_spacing_type)
-
-        #Create the base shape of the cross-section
-        for u in range(self.ustep):
-            x = self.cross_axes[0]*cos(cross_params[u])
-            y = 0.0
-            z = self.cross_axes[1]*sin(cross_params[u])
-            cross_base_vertices.append(Vector((x, y, z)))
-
-        #Create the base shape of the ring, and combine it with information on how to rotate and align the cross-section
-        for v in range(self.vstep):
-            x = self.ring_axes[0]*cos(ring_params[v])
-            y = self.ring_axes[1]*sin(ring_params[v])
-            z = 0.0
-            ring_vertices.append(Vector((x, y, z)))
+    def generate(self, context):
+        prepared = self.prepare()
+        if prepared is None:
+            return {"CANCELLED"}
+        parameters, arguments, lod_factors = prepared
+        levels = self.getLevels(arguments, lod_factors, self.use_normals or self.use_uvs)
+        self.linkLevels(context, parameters, lod_factors, levels)
+        return {"FINISHED"}
 
-        #Calculate cross-section transformation matrix for each of the vertices of the ring
-        for v in range(self.vstep):
-            prev_vertex = ring_vertices[(self.vstep+v-1)%self.vstep]
-            this_vertex = ring_vertices[v]
-            next_vertex = ring_vertices[(v+1)%self.vstep]
-            angle = (this_vertex-prev_vertex).angle(this_vertex-next_vertex)/2.0
-            cross_trans_mat = Matrix().Rotation(self.cross_rotation+getTwistAngle(self.cross_twist,
-                                                                                  self.cross_twist_amplitude,
-                                                                                  self.cross_twist_type,
-                                                                                  v,
-                                                                                  self.vstep),
-                                                4,
-                                                Vector((0.0, 1.0, 0.0)))
-            if self.tube_thickness_method == "thickness.tube":
-                cross_trans_mat = Matrix().Scale(1.0/sin(angle), 4, Vector((1.0, 0.0, 0.0)))*cross_trans_mat
-            cross_trans_mat = Matrix().Rotation(ring_normals[v], 4, Vector((0.0, 0.0, 1.0)))*cross_trans_mat
-            cross_transforms.append(cross_trans_mat)
+    #Turn the properties into the parameters stored on the objects and the arguments of the geometry kernel,
+    #together with the level of detail factors, or report the error and return None if they can't be parsed
+    def prepare(self):
+        from .Geometry.Shapes import getShapeArguments
+        from .Geometry.LevelsOfDetail import parseLODFactors
 
-        #Put a cross-section at each ring vertex and connect with faces
-        for v in range(self.vstep):
-            for u in range(self.ustep):
-                cross_vertex = cross_transforms[v]*cross_base_vertices[u]+ring_vertices[v]
+        parameters = getOperatorParameters(self, "elliptic_torus")
+        try:
+            arguments = getShapeArguments("elliptic_torus", splitSurfaceOptions(parameters)[0])
+            lod_factors = parseLODFactors(self.lod_factors)
+        except ValueError as error:
+            self.report({"ERROR"}, str(error))
+            return None
+        return parameters, arguments, lod_factors
 
-                #Append the vertex coordinates to the list of vertices, and append a face to the list of faces.
-                #The list of faces uses vertices that have not yet been created when appending intermediate faces,
-                #however this is remedied at the end, as then it bridges with the vertices created at the beginning.
-                #It uses modulo to make sure it doesn't overflow.
-                vertices.append(cross_vertex)
-                #Offset the bridge if the angle is obtuse
-                if (cos(getTwistAngle(self.cross_twist, 
-                                      self.cross_twist_amplitude,
-                                      self.cross_twist_type,
-                                      (v+1)%self.vstep, self.vstep)-
-                        getTwistAngle(self.cross_twist,
-                                      self.cross_twist_amplitude,
-                                      self.cross_twist_type,
-                                      v,
-                                      self.vstep)) < 0.0):
+    #Calculate the vertices and faces of each level of detail, or of the torus if there are none,
+    #followed by the normals and texture coordinates if surface is set, yielding one level at a time.
+    #It doesn't touch any Blender data, so that it can run on a background thread.
+    @staticmethod
+    def iterLevels(arguments, lod_factors, surface=False):
+        from .Geometry.Torus import getTorusGeometry, iterTorusLODGeometry
 
-                    u_bridge_pos = (u+self.ustep//2)%self.ustep
+        if lod_factors:
+            return iterTorusLODGeometry(lod_factors, surface=surface, **arguments)
+        return iter([getTorusGeometry(surface=surface, **arguments)])
 
-                else:
+    @staticmethod
+    def getLevels(arguments, lod_factors, surface=False):
+        return list(EllipticTorusGenerator.iterLevels(arguments, lod_factors, surface))
 
-                    u_bridge_pos = u
+    #Create the meshes of the levels and the objects using them
+    def linkLevels(self, context, parameters, lod_factors, levels):
+        from .Geometry.Ellipse import getSegmentCount, getAdaptiveDeviation, MAX_ADAPTIVE_STEPS
+        from .Geometry.Placement import getArrayLocations
+        from .MeshBuilder import fillMesh
 
-                faces.append([v*self.ustep+u,
-                              ((v+1)%self.vstep)*self.ustep+u_bridge_pos,
-                              ((v+1)%self.vstep)*self.ustep+((u_bridge_pos+1)%self.ustep),
-                              v*self.ustep+((u+1)%self.ustep)])
+        #Report the number of segments the adaptive spacing settled on
+        if "spacing.adaptive" in (self.ring_spacing_type, self.cross_spacing_type):
+            ring_segments = getSegmentCount(self.ring_axes[0], self.ring_axes[1], self.vstep,
+                                            self.ring_spacing_type, self.ring_tolerance)
+            cross_segments = getSegmentCount(self.cross_axes[0], self.cross_axes[1], self.ustep,
+                                             self.cross_spacing_type, self.cross_tolerance)
+            self.report({"INFO"}, "{} ring segments, {} cross-section segments".format(ring_segments, cross_segments))
+            for name, axes, spacing_type, tolerance in (("ring", self.ring_axes, self.ring_spacing_type, self.ring_tolerance),
+                                                        ("cross-section", self.cross_axes, self.cross_spacing_type, self.cross_tolerance)):
+                if spacing_type == "spacing.adaptive":
+                    deviation = getAdaptiveDeviation(axes[0], axes[1], tolerance)
+                    if deviation > tolerance:
+                        self.report({"WARNING"}, "The {} is {:.3g} away from the ellipse at the limit of {} segments, "
+                                                 "above the tolerance of {:.3g}".format(name, deviation, MAX_ADAPTIVE_STEPS, tolerance))
 
         #Deselect everything
         bpy.ops.object.select_all(action="DESELECT")
 
-        #Create the mesh and the object, select it and make it active.
-        elliptic_torus_mesh = bpy.data.meshes.new("Elliptic Torus")
-        elliptic_torus_mesh.from_pydata(vertices, [], faces)
-        elliptic_torus_mesh.update()
-        elliptic_torus_object = bpy.data.objects.new("Elliptic Torus", elliptic_torus_mesh)
-        context.scene.objects.link(elliptic_torus_object)
-        elliptic_torus_object.select = True
-        bpy.context.scene.objects.active = elliptic_torus_object
-        return {"FINISHED"}
\ No newline at end of file
+        #Create the mesh of each level once, and the objects of each copy sharing them.
+        #Select the top objects and make the first one active.
+        meshes = []
+        for level, geometry in enumerate(levels):
+            vertices, faces = geometry[:2]
+            normals, uvs = geometry[2:] if len(geometry) > 2 else (None, None)
+            elliptic_torus_mesh = bpy.data.meshes.new("Elliptic Torus LOD{}".format(level) if lod_factors else "Elliptic Torus")
+            with Profiling.stage("mesh.upload"):
+                fillMesh(elliptic_torus_mesh, vertices, faces, None,
+                         normals if self.use_normals else None, uvs if self.use_uvs else None)
+            meshes.append(elliptic_torus_mesh)
+        with Profiling.stage("object.link"):
+            locations = getArrayLocations(self.array_count, self.array_pattern, self.array_spacing, self.array_seed)
+            top_objects = createShapeObjects(context, "Elliptic Torus", "elliptic_torus", parameters,
+                                             meshes, lod_factors, locations.tolist())
+            for top_object in top_objects:
+                top_object.select = True
+            bpy.context.scene.objects.active = top_objects[0]
+
+class MESH_OT_elliptic_torus_add(EllipticTorusProperties, EllipticTorusGenerator, Operator):
+    bl_idname = "mesh.elliptic_torus_add"
+    bl_label = "Add Elliptic Torus"
+    bl_options = {"REGISTER", "UNDO", "PRESET"}
+
+#The elliptic torus operator, calculating the torus on a background thread so that Blender stays responsive
+#while the slow spacings are solved. The progress is shown in the header of the area it was started from,
+#Esc cancels it, and the meshes are created on the main thread once the calculation is done.
+#Redoing it from the redo panel runs the calculation in the foreground, like the plain operator.
+#State of an elliptic torus built on a background thread. The thread only ever touches this object, never
+#the operator, which Blender may free while the thread is still running, and the modal operator polls it.
+class EllipticTorusJob:
+    def __init__(self, parameters, arguments, lod_factors, surface):
+        self.parameters = parameters
+        self.arguments = arguments
+        self.lod_factors = lod_factors
+        self.surface = surface
+        self.levels = None
+        self.error = None
+        self.cancelled = threading.Event()
+        self.finished = threading.Event()
+        self.progress = 0.0
+        self.status = "Starting"
+
+    #Solve both ellipses, which are the slow part and are kept in the parameter cache for the levels,
+    #then build each level, checking for cancellation in between
+    def run(self):
+        from .Geometry.Ellipse import getParamAndNormal
+
+        arguments = self.arguments
+        factors = self.lod_factors or [None]
+        steps = 2+len(factors)
+        try:
+            self.status = "Solving the ring spacing"
+            getParamAndNormal(arguments["ring_axes"][0], arguments["ring_axes"][1], arguments["vstep"],
+                              arguments["ring_spacing_type"], arguments["ring_tolerance"])
+            if self.cancelled.is_set():
+                return
+            self.progress = 1.0/steps
+            self.status = "Solving the cross-section spacing"
+            getParamAndNormal(arguments["cross_axes"][0], arguments["cross_axes"][1], arguments["ustep"],
+                              arguments["cross_spacing_type"], arguments["cross_tolerance"])
+            if self.cancelled.is_set():
+                return
+            #The levels share the frames of the full torus, which are calculated along with the first level
+            levels = []
+            self.progress = 2.0/steps
+            self.status = "Building level 1 of {}".format(len(factors)) if self.lod_factors else "Building the mesh"
+            for level, geometry in enumerate(EllipticTorusGenerator.iterLevels(arguments, self.lod_factors, self.surface)):
+                levels.append(geometry)
+                if self.cancelled.is_set():
+                    return
+                self.progress = (3.0+level)/steps
+                if level+1 < len(factors):
+                    self.status = "Building level {} of {}".format(level+2, len(factors))
+            self.levels = levels
+        except Exception as error:
+            self.error = error
+        finally:
+            self.finished.set()
+
+class MESH_OT_elliptic_torus_add_background(EllipticTorusProperties, EllipticTorusGenerator, Operator):
+    bl_idname = "mesh.elliptic_torus_add_background"
+    bl_label = "Add Elliptic Torus in the Background"
+    bl_options = {"REGISTER", "UNDO", "PRESET"}
+
+    def invoke(self, context, event):
+        prepared = self.prepare()
+        if prepared is None:
+            return {"CANCELLED"}
+        parameters, arguments, lod_factors = prepared
+        self.job = EllipticTorusJob(parameters, arguments, lod_factors, self.use_normals or self.use_uvs)
+        self.profile = Profiling.snapshot() if Profiling.enabled else None
+        thread = threading.Thread(target=self.job.run)
+        thread.daemon = True
+        thread.start()
+
+        window_manager = context.window_manager
+        window_manager.progress_begin(0, 100)
+        self.timer = window_manager.event_timer_add(0.1, context.window)
+        self.area = context.area
+        window_manager.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def finish(self, context):
+        window_manager = context.window_manager
+        window_manager.event_timer_remove(self.timer)
+        window_manager.progress_end()
+        if self.area is not None:
+            self.area.header_text_set()
+
+    def modal(self, context, event):
+        if event.type == "ESC":
+            #The thread finishes its current step on its own, and its result is thrown away
+            self.job.cancelled.set()
+            self.finish(context)
+            self.report({"INFO"}, "Elliptic torus cancelled")
+            return {"CANCELLED"}
+        if event.type != "TIMER":
+            return {"PASS_THROUGH"}
+        if not self.job.finished.is_set():
+            context.window_manager.progress_update(int(100*self.job.progress))
+            if self.area is not None:
+                self.area.header_text_set("Elliptic Torus: {} ({:.0f}%), Esc to cancel".format(self.job.status, 100*self.job.progress))
+            return {"PASS_THROUGH"}
+
+        self.finish(context)
+        if self.job.error is not None:
+            self.report({"ERROR"}, str(self.job.error))
+            return {"CANCELLED"}
+        self.linkLevels(context, self.job.parameters, self.job.lod_factors, self.job.levels)
+        if self.profile is not None:
+            self.report({"INFO"}, Profiling.formatReport(self.profile))
+        return {"FINISHED"}
@@ -0,0 +1,92 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Registry of the interchangeable numeric backends of the geometry kernels.
+#Whether a backend is available is decided by looking for its top-level packages, without importing
+#them, and a backend is only imported the first time it is used. This keeps optional, heavy packages
+#such as SciPy out of add-on registration and out of the enum callbacks of the operators.
+
+import importlib.util
+import sys
+from collections import OrderedDict
+from . import Profiling
+
+class Backend:
+    def __init__(self, name, label, packages, loader):
+        self.name = name
+        self.label = label
+        self.packages = tuple(packages)
+        self.loader = loader
+        self.value = None
+
+    #Only finds the packages, find_spec of a top-level package never imports anything
+    def available(self):
+        return all(package in sys.modules or importlib.util.find_spec(package) is not None
+                   for package in self.packages)
+
+    def loaded(self):
+        return all(package in sys.modules for package in self.packages)
+
+    def load(self):
+        if self.value is None:
+            with Profiling.stage("backend.load.{}".format(self.name)):
+                self.value = self.loader()
+        return self.value
+
+#Kind -> OrderedDict of name -> Backend, in order of registration
+registry = OrderedDict()
+#Kind -> name of the backend selected in the preferences, "automatic" if missing
+preferred = {}
+
+def registerBackend(kind, name, label, packages, loader):
+    registry.setdefault(kind, OrderedDict())[name] = Backend(name, label, packages, loader)
+
+def getBackends(kind):
+    return [backend for backend in registry.get(kind, {}).values() if backend.available()]
+
+def setPreferredBackend(kind, name):
+    preferred[kind] = name or "automatic"
+
+#The backend to use for kind: the preferred one if available, otherwise the first available one whose
+#packages are already imported, otherwise the first available one
+def selectBackend(kind):
+    backends = getBackends(kind)
+    if not backends:
+        raise ImportError("No backend available for {}".format(kind))
+    for backend in backends:
+        if backend.name == preferred.get(kind, "automatic"):
+            return backend
+    for backend in backends:
+        if backend.loaded():
+            return backend
+    return backends[0]
+
+def getBackend(kind):
+    return selectBackend(kind).load()
+
+def loadNumPyTridiagonal():
+    from .Tridiagonal import solveTridiagonal
+    return solveTridiagonal
+
+def loadSciPyTridiagonal():
+    from scipy.linalg import solve_banded
+    from .Tridiagonal import bandedSolver
+    return bandedSolver(solve_banded)
+
+registerBackend("tridiagonal", "numpy", "NumPy", ("numpy",), loadNumPyTridiagonal)
+registerBackend("tridiagonal", "scipy", "SciPy (LAPACK)", ("numpy", "scipy"), loadSciPyTridiagonal)
@@ -0,0 +1,144 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Headless generation of DD Shapes geometry, for parameter sweeps outside of Blender.
+#Run from the add-on directory with:
+#    python -m Geometry.Batch sweep.json --output meshes --workers 8 --format ply
+#
+#A JSON sweep file holds one sweep, or a list of sweeps, like
+#    {"shape": "elliptic_torus",
+#     "fixed": {"ring_axes": [3.0, 1.0]},
+#     "grid": {"vstep": [48, 96, 192], "ring_spacing_type": ["spacing.area", "spacing.arc"]}}
+#where every combination of the values in grid makes one job.
+#A CSV sweep file holds one job per row, with a "shape" column and one column per parameter.
+#Vector parameters are written as values separated by semicolons, and empty cells keep the default.
+
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .Shapes import getShapeArguments
+from .Export import exportShape, getFaceCount, WRITERS
+
+#Expand a sweep into one (shape, parameters) job per combination of its grid values
+def expandSweep(sweep):
+    fixed = sweep.get("fixed", {})
+    grid = sweep.get("grid", {})
+    names = sorted(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        parameters = dict(fixed)
+        parameters.update(zip(names, values))
+        jobs.append((sweep["shape"], parameters))
+    return jobs
+
+#Convert a CSV cell to an int, a float, a tuple of floats or a string
+def parseValue(text):
+    if ";" in text:
+        return tuple(float(value) for value in text.split(";"))
+    for value_type in (int, float):
+        try:
+            return value_type(text)
+        except ValueError:
+            pass
+    return text
+
+#Read a JSON or CSV sweep file into a list of (shape, parameters) jobs
+def loadSweep(path):
+    jobs = []
+    if path.lower().endswith(".csv"):
+        with open(path, newline="") as csv_file:
+            for row in csv.DictReader(csv_file):
+                shape = row.pop("shape")
+                jobs.append((shape, dict((name, parseValue(value.strip())) for name, value in row.items() if value.strip())))
+    else:
+        with open(path) as json_file:
+            sweeps = json.load(json_file)
+        if isinstance(sweeps, dict):
+            sweeps = [sweeps]
+        for sweep in sweeps:
+            jobs.extend(expandSweep(sweep))
+    return jobs
+
+#Generate one shape while streaming it to path, and time it
+def runJob(name, shape, parameters, path):
+    start = time.perf_counter()
+    stream = exportShape(shape, getShapeArguments(shape, parameters), path)
+    return {"name": name,
+            "shape": shape,
+            "parameters": parameters,
+            "path": path,
+            "vertices": stream.vertex_count,
+            "faces": getFaceCount(stream),
+            "seconds": time.perf_counter()-start}
+
+#Run all jobs on a pool of worker processes, writing each mesh to output_directory in file_format as soon
+#as it is done, and a summary with the timing of each job to summary.json. progress is called with the result of each job.
+def runSweep(jobs, output_directory, workers=None, progress=None, file_format="npz"):
+    os.makedirs(output_directory, exist_ok=True)
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for index, (shape, parameters) in enumerate(jobs):
+            name = "{:04d}_{}".format(index, shape)
+            path = os.path.join(output_directory, name+"."+file_format)
+            futures[executor.submit(runJob, name, shape, parameters, path)] = (name, shape, parameters)
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as error:
+                name, shape, parameters = futures[future]
+                result = {"name": name, "shape": shape, "parameters": parameters, "error": str(error)}
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    summary = {"workers": workers or os.cpu_count(),
+               "total_seconds": time.perf_counter()-start,
+               "jobs": sorted(results, key=lambda result: result["name"])}
+    with open(os.path.join(output_directory, "summary.json"), "w") as summary_file:
+        json.dump(summary, summary_file, indent=2)
+    return summary
+
+def printResult(result):
+    if "error" in result:
+        print("{name}: failed: {error}".format(**result))
+    else:
+        print("{name}: {vertices} vertices, {faces} faces in {seconds:.3f} s".format(**result))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m Geometry.Batch",
+                                     description="Generate DD Shapes meshes for every job of a JSON or CSV parameter sweep.")
+    parser.add_argument("sweep", help="JSON or CSV sweep file")
+    parser.add_argument("-o", "--output", default="dd_shapes_output", help="directory to write the meshes and summary.json to")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="number of worker processes (default: one per CPU)")
+    parser.add_argument("-f", "--format", choices=sorted(WRITERS), default="npz", help="file format of the meshes (default: npz)")
+    args = parser.parse_args(argv)
+
+    jobs = loadSweep(args.sweep)
+    summary = runSweep(jobs, args.output, args.workers, printResult, args.format)
+    failed = sum(1 for result in summary["jobs"] if "error" in result)
+    print("{} jobs, {} failed, {:.3f} s on {} workers".format(len(jobs), failed, summary["total_seconds"], summary["workers"]))
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#The parameterization caches shared by the operators. They live in a module of their own, which does
+#not import NumPy, so that the add-on preferences can configure them without loading the geometry.
+
+from .Cache import LRUCache
+from .DiskCache import DiskCache, defaultCacheDirectory
+
+#Parameters and normals already calculated, keyed on (major, minor, steps, spacing_type),
+#or on (major, minor, tolerance, spacing_type) for the adaptive spacing,
+#so that redoing an operator without changing an ellipse never has to solve it again
+param_cache = LRUCache(64)
+
+#Solutions of the slowest spacing types, kept on disk across sessions if enabled
+disk_cache = DiskCache(defaultCacheDirectory())
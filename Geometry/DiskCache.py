@@ -0,0 +1,114 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import hashlib
+import os
+import sys
+
+#Per-user cache directory, following the convention of each platform
+def defaultCacheDirectory():
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA", os.path.expanduser("~"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser(os.path.join("~", "Library", "Caches"))
+    else:
+        base = os.environ.get("XDG_CACHE_HOME", os.path.expanduser(os.path.join("~", ".cache")))
+    return os.path.join(base, "DDShapes")
+
+#Cache of parameter and normal arrays, one .npy file per entry, which is memory-mapped when loaded.
+#It stays disabled until it is explicitly enabled. The least recently used files are removed
+#once the files take up more than max_bytes. The version is part of each key, so that entries
+#written by another version of the add-on are never used.
+class DiskCache:
+    def __init__(self, directory, max_bytes=64*2**20, version=()):
+        self.enabled = False
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = tuple(version)
+
+    def path(self, key):
+        digest = hashlib.sha1(repr((tuple(key), self.version)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest+".npy")
+
+    def load(self, key):
+        if not self.enabled:
+            return None
+        #Imported here, so that configuring the cache doesn't import NumPy
+        import numpy
+        path = self.path(key)
+        try:
+            values = numpy.load(path, mmap_mode="r")
+            #Mark the entry as recently used
+            os.utime(path, None)
+        except (IOError, OSError, ValueError):
+            return None
+        return values[0], values[1]
+
+    def store(self, key, param_list, normal_list):
+        if not self.enabled:
+            return
+        import numpy
+        path = self.path(key)
+        temp_path = "{}.{}.tmp".format(path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, "wb") as temp_file:
+                numpy.save(temp_file, numpy.stack((param_list, normal_list)))
+            os.replace(temp_path, path)
+        except (IOError, OSError):
+            return
+        self.evict()
+
+    def entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except (IOError, OSError):
+            return []
+        entries = []
+        for name in names:
+            if name.endswith(".npy"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except (IOError, OSError):
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def size(self):
+        return sum(entry[1] for entry in self.entries())
+
+    #Remove the least recently used files until the cache fits within max_bytes
+    def evict(self):
+        entries = sorted(self.entries())
+        total = sum(entry[1] for entry in entries)
+        for mtime, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except (IOError, OSError):
+                pass
+
+    def clear(self):
+        for mtime, size, path in self.entries():
+            try:
+                os.remove(path)
+            except (IOError, OSError):
+                pass
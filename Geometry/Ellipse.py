@@ -0,0 +1,276 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from math import cos, sin, pi, atan2, sqrt, ceil
+import numpy
+from . import Backends, Profiling
+from .Caches import param_cache, disk_cache
+from .EllipticIntegrals import completeE, inverseIncompleteE
+
+#Arc lengths on the ellipse (major*cos(t), minor*sin(t)) are elliptic integrals of the second kind around
+#its longer semi-axis: the speed along the ellipse is longer*sqrt(1-m*sin(u)**2), with m = 1-(shorter/longer)**2
+#and u = t when minor is the longer semi-axis, or u = t-pi/2 otherwise.
+#They are exact to about machine precision for all axis ratios, degenerate ellipses included.
+def arcModulus(major, minor):
+    longer, shorter = max(major, minor), min(major, minor)
+    return longer, 1.0-(shorter/longer)**2
+
+#Circumference of the ellipse
+def circumference(major, minor):
+    longer, m = arcModulus(major, minor)
+    return 4.0*longer*float(completeE(m))
+
+#Parameters at each of the arc lengths from parameter 0
+def arcParams(lengths, major, minor):
+    longer, m = arcModulus(major, minor)
+    complete = float(completeE(m))
+    if minor >= major:
+        return inverseIncompleteE(numpy.asarray(lengths)/longer, m, complete)
+    return inverseIncompleteE(numpy.asarray(lengths)/longer-complete, m, complete)+pi/2
+
+#The ellipse is symmetric about both of its axes, so a set of points spaced along it from parameter 0 is
+#determined by its first half if steps is even, and by its first quadrant if steps is divisible by 4.
+#Returns into how many parts the circumference can be split, each of which holds steps/parts points.
+def symmetryParts(steps):
+    if steps%4 == 0:
+        return 4
+    if steps%2 == 0:
+        return 2
+    return 1
+
+#Complete the parameters of the points in the first of parts parts to the whole circumference:
+#the second quadrant mirrors the first about the minor axis, and the second half is the first turned by pi.
+def mirrorParams(params, parts):
+    if parts == 4:
+        params = numpy.concatenate((params, [pi/2], pi-params[:0:-1]))
+    if parts >= 2:
+        params = numpy.concatenate((params, params+pi))
+    return params
+
+#Place steps points at equal arc distance along the circumference of the ellipse, starting at parameter 0
+def equalArcParams(major, minor, steps):
+    parts = symmetryParts(steps)
+    params = arcParams(circumference(major, minor)*numpy.arange(steps//parts)/steps, major, minor)
+    params[0] = 0.0
+    return mirrorParams(params, parts)
+
+#Lengths of the chords between consecutive parameters, the last chord ending at end, which closes
+#the ellipse by default, together with the derivatives of each chord length with respect to its start and end parameter
+def chordLengths(params, major, minor, end=None):
+    if end is None:
+        end = params[0]+2*pi
+    ends = numpy.append(params[1:], end)
+    x_diffs = major*(numpy.cos(ends)-numpy.cos(params))
+    y_diffs = minor*(numpy.sin(ends)-numpy.sin(params))
+    lengths = numpy.hypot(x_diffs, y_diffs)
+    start_derivs = (x_diffs*major*numpy.sin(params)-y_diffs*minor*numpy.cos(params))/lengths
+    end_derivs = (y_diffs*minor*numpy.cos(ends)-x_diffs*major*numpy.sin(ends))/lengths
+    return lengths, start_derivs, end_derivs
+
+#Place steps points on the ellipse such that all edges are of equal length, starting at parameter 0.
+#Each residual is the difference in length of two consecutive edges, which only depends on three
+#consecutive parameters, so Newton's method only needs to solve a tridiagonal system per iteration.
+#Only the first quadrant or half is solved for, between its fixed end points, when steps allows it.
+def equalChordParams(major, minor, steps, xtol=1.49012e-08, maxiter=50):
+    #Equally spaced parameters already give equal edges on a circle
+    if major == minor:
+        return 2*pi*numpy.arange(steps)/steps
+
+    #Start from points at equal arc length, which is close to equal edge length.
+    #A degenerate ellipse is a line segment traversed back and forth, its Jacobian is singular,
+    #and equal arc length is as close to equal edges as it gets.
+    params = equalArcParams(major, minor, steps)
+    if major == 0.0 or minor == 0.0:
+        return params
+
+    parts = symmetryParts(steps)
+    params = params[:steps//parts]
+    end = 2*pi/parts
+    solveTridiagonal = Backends.getBackend("tridiagonal")
+    for iteration in range(maxiter if len(params) > 1 else 0):
+        Profiling.count("equalChordParams.iterations")
+        Profiling.count("equalChordParams.residual_evaluations", len(params)-1)
+        lengths, start_derivs, end_derivs = chordLengths(params, major, minor, end)
+        residuals = lengths[1:]-lengths[:-1]
+
+        #Only params[1:] are unknowns, params[0] stays at 0
+        step = solveTridiagonal(-start_derivs[1:-1],
+                                start_derivs[1:]-end_derivs[:-1],
+                                end_derivs[1:-1],
+                                -residuals)
+
+        #Shorten the step if it would move a point past one of its neighbours
+        new_params = params.copy()
+        new_params[1:] += step
+        while numpy.any(numpy.diff(new_params) <= 0.0) or new_params[-1] >= end:
+            step /= 2.0
+            new_params[1:] = params[1:]+step
+        params = new_params
+
+        if numpy.max(numpy.abs(step)) <= xtol*numpy.max(numpy.abs(params)):
+            break
+
+    return mirrorParams(params, parts)
+
+#Largest number of steps the adaptive spacing places on an ellipse, however small the tolerance,
+#the same as the largest number of segments of the operators
+MAX_ADAPTIVE_STEPS = 1024
+
+#Number of samples per quadrant of the point density of the adaptive spacing, taken both at equal
+#parameter increments and at equal normal increments, so that neither the flat nor the sharp ends are undersampled
+ADAPTIVE_SAMPLES = 256
+
+#Largest distance between each chord between consecutive parameters, the last chord ending at end,
+#which closes the ellipse by default, and the arc of the ellipse it cuts off.
+#The ellipse is a scaled circle, so the point of the arc with its tangent parallel to the chord,
+#which is the farthest one from it, is at the mean of the two parameters, as it is on the circle.
+def chordDeviations(params, major, minor, end=None):
+    if end is None:
+        end = params[0]+2*pi
+    ends = numpy.append(params[1:], end)
+    middles = (params+ends)/2
+    x_starts = major*numpy.cos(params)
+    y_starts = minor*numpy.sin(params)
+    x_diffs = major*numpy.cos(ends)-x_starts
+    y_diffs = minor*numpy.sin(ends)-y_starts
+    return numpy.abs(x_diffs*(minor*numpy.sin(middles)-y_starts)-y_diffs*(major*numpy.cos(middles)-x_starts))/numpy.hypot(x_diffs, y_diffs)
+
+#Place as few points on the ellipse as possible, starting at parameter 0, such that no edge is farther than
+#tolerance from the ellipse. An arc of length s and curvature k is about k*s**2/8 away from its chord,
+#so the points are spaced sqrt(8*tolerance/k) apart, which is sqrt(8*tolerance/(major*minor)*speed) in the
+#parameter, with speed the speed along the ellipse. The number of points is then raised until the exact
+#deviations are within tolerance. The points are placed in the first quadrant and mirrored to the others.
+def adaptiveParams(major, minor, tolerance, max_steps=MAX_ADAPTIVE_STEPS):
+    #A degenerate ellipse is a line segment, which is followed exactly by the edges between its ends and its middle
+    if major == 0.0 or minor == 0.0:
+        return mirrorParams(numpy.zeros(1), 4)
+
+    samples = numpy.linspace(0.0, pi/2, ADAPTIVE_SAMPLES)
+    samples = numpy.union1d(samples, numpy.arctan2(minor*numpy.sin(samples), major*numpy.cos(samples)))
+    densities = (major**2*numpy.sin(samples)**2+minor**2*numpy.cos(samples)**2)**-0.25
+    cumulative = numpy.append(0.0, numpy.cumsum((densities[1:]+densities[:-1])/2*numpy.diff(samples)))
+
+    max_quadrant_steps = max(1, max_steps//4)
+    quadrant_steps = min(max(1, int(ceil(sqrt(major*minor/(8*tolerance))*cumulative[-1]))), max_quadrant_steps)
+    while True:
+        Profiling.count("adaptiveParams.iterations")
+        params = numpy.interp(cumulative[-1]*numpy.arange(quadrant_steps)/quadrant_steps, cumulative, samples)
+        deviation = numpy.max(chordDeviations(params, major, minor, pi/2))
+        if deviation <= tolerance or quadrant_steps == max_quadrant_steps:
+            break
+        quadrant_steps = min(max(quadrant_steps+1, int(ceil(quadrant_steps*sqrt(deviation/tolerance)))), max_quadrant_steps)
+
+    return mirrorParams(params, 4)
+
+#Spacing types for which every factor-th of steps points is the same as steps/factor points,
+#so that coarser levels of detail can be taken from finer ones
+NESTED_SPACING_TYPES = ("spacing.area", "spacing.normal", "spacing.radius", "spacing.arc")
+
+#Spacing types slow enough to keep their solutions on disk across sessions, if enabled
+DISK_CACHED_SPACING_TYPES = ("spacing.dist", "spacing.arc")
+
+#Make an array read-only, since the arrays in param_cache are shared between all callers
+def readOnly(values):
+    values = numpy.array(values, dtype=float)
+    values.flags.writeable = False
+    return values
+
+#Parameters and normals of steps points on the ellipse, spaced according to spacing_type.
+#The adaptive spacing ignores steps, and places as many points as it needs to stay within tolerance.
+def getParamAndNormal(major, minor, steps, spacing_type, tolerance=None):
+    with Profiling.stage("getParamAndNormal"):
+        key = (major, minor, steps, spacing_type)
+        if spacing_type == "spacing.adaptive":
+            key = (major, minor, tolerance, spacing_type)
+        result = param_cache.get(key)
+        if result is not None:
+            Profiling.count("getParamAndNormal.cache_hits")
+        elif spacing_type in DISK_CACHED_SPACING_TYPES:
+            result = disk_cache.load(key)
+            if result is not None:
+                Profiling.count("getParamAndNormal.disk_cache_hits")
+                param_cache.put(key, result)
+        if result is None:
+            with Profiling.stage("solveParamAndNormal"):
+                param_list, normal_list = solveParamAndNormal(major, minor, steps, spacing_type, tolerance)
+            result = readOnly(param_list), readOnly(normal_list)
+            param_cache.put(key, result)
+            if spacing_type in DISK_CACHED_SPACING_TYPES:
+                disk_cache.store(key, *result)
+    return result
+
+def solveParamAndNormal(major, minor, steps, spacing_type, tolerance=None):
+    param_list = []
+    normal_list = []
+    if spacing_type == "spacing.adaptive":
+        param_list = adaptiveParams(major, minor, tolerance)
+        normal_list = numpy.arctan2(major*numpy.sin(param_list), minor*numpy.cos(param_list))
+    elif spacing_type == "spacing.dist":
+        param_list = equalChordParams(major, minor, steps)
+        normal_list = numpy.arctan2(major*numpy.sin(param_list), minor*numpy.cos(param_list))
+    elif spacing_type == "spacing.arc" and major != minor:
+        param_list = equalArcParams(major, minor, steps)
+        normal_list = numpy.arctan2(major*numpy.sin(param_list), minor*numpy.cos(param_list))
+    else:
+        for step in range(steps):
+            #Both the parameter and the normal are always 0 at the first step
+            if step == 0:
+                param_list.append(0.0)
+                normal_list.append(0.0)
+            #All the algorithms yield the same result for circles,
+            #thus we ignore spacing_type if major and minor are equal
+            elif major == minor or spacing_type == "spacing.area":
+                param_list.append(2*pi*step/steps)
+                normal_list.append(atan2(major*sin(2*pi*step/steps), minor*cos(2*pi*step/steps)))
+            elif spacing_type == "spacing.normal":
+                normal_list.append(2*pi*step/steps)
+                param_list.append(atan2(minor*sin(2*pi*step/steps), major*cos(2*pi*step/steps)))
+            elif spacing_type == "spacing.radius":
+                param_list.append(atan2(major*sin(2*pi*step/steps), minor*cos(2*pi*step/steps)))
+                normal_list.append(atan2(major*sin(param_list[step]), minor*cos(param_list[step])))
+
+    return param_list, normal_list
+
+#Derivative of the parameters of getParamAndNormal with respect to the position along the ellipse, which runs
+#from 0 to 1 with the vertex index. It has a closed form for the spacings that map the position straight to an
+#angle, and is taken by central differences of the solved parameters for the others.
+def getParamRates(params, major, minor, spacing_type):
+    params = numpy.asarray(params, dtype=float)
+    positions = 2*pi*numpy.arange(len(params))/len(params)
+    if major == minor or spacing_type == "spacing.area":
+        return numpy.full(len(params), 2*pi)
+    if spacing_type in ("spacing.normal", "spacing.radius"):
+        #params is atan2(p*sin(w), q*cos(w)) for the angle w of the position
+        p, q = (minor, major) if spacing_type == "spacing.normal" else (major, minor)
+        denominators = (q*numpy.cos(positions))**2+(p*numpy.sin(positions))**2
+        safe = numpy.where(denominators > 0.0, denominators, 1.0)
+        return numpy.where(denominators > 0.0, 2*pi*p*q/safe, 0.0)
+    #The parameters increase by 2*pi once around the ellipse
+    following = numpy.append(params[1:], params[0]+2*pi)
+    preceding = numpy.insert(params[:-1], 0, params[-1]-2*pi)
+    return (following-preceding)*len(params)/2.0
+
+#Largest distance between the edges of the adaptive spacing and the ellipse,
+#which is above tolerance if MAX_ADAPTIVE_STEPS points weren't enough to reach it
+def getAdaptiveDeviation(major, minor, tolerance):
+    params = getParamAndNormal(major, minor, 0, "spacing.adaptive", tolerance)[0]
+    return float(numpy.max(chordDeviations(params, major, minor)))
+
+#Number of segments getParamAndNormal places on the ellipse, which only differs from steps for the adaptive spacing
+def getSegmentCount(major, minor, steps, spacing_type, tolerance=None):
+    return len(getParamAndNormal(major, minor, steps, spacing_type, tolerance)[0])
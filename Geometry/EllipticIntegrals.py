@@ -0,0 +1,148 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Elliptic integrals of the second kind, and the inverse of the incomplete one, vectorized with NumPy.
+#Both are computed by the arithmetic-geometric mean and the descending Landen transformation, which
+#converge quadratically: 5 iterations are enough for m up to 0.999, and 8 for m up to 1-1e-15.
+#The parameter m is the square of the modulus, E(phi, m) = integral of sqrt(1-m*sin(t)**2) from 0 to phi,
+#with 0 <= m <= 1.
+
+import numpy
+from math import sqrt
+from . import Profiling
+
+EPSILON = numpy.finfo(float).eps
+
+#Gauss-Legendre rule of the table from which inverseIncompleteE starts
+gauss_nodes, gauss_weights = numpy.polynomial.legendre.leggauss(8)
+
+#Arithmetic-geometric mean of 1 and sqrt(1-m) for a single m < 1, as the lists of a[n], b[n] and c[n]
+def landenSequence(m):
+    arithmetic, geometric, difference = [1.0], [sqrt(1.0-m)], [sqrt(m)]
+    while difference[-1] > EPSILON*arithmetic[-1]:
+        arithmetic.append((arithmetic[-1]+geometric[-1])/2.0)
+        geometric.append(sqrt(arithmetic[-2]*geometric[-1]))
+        difference.append((arithmetic[-2]-geometric[-2])/2.0)
+    return arithmetic, geometric, difference
+
+#E(m)/K(m) = 1-sum(2**(n-1)*c[n]**2) and K(m) = pi/(2*a[N])
+def completeRatio(difference):
+    return 1.0-sum(2.0**(n-1)*value**2 for n, value in enumerate(difference))
+
+#Complete elliptic integral of the second kind E(m), for a single m or an array of m
+def completeE(m):
+    if numpy.ndim(m) == 0:
+        if m >= 1.0:
+            return 1.0
+        arithmetic, geometric, difference = landenSequence(float(m))
+        return completeRatio(difference)*numpy.pi/(2.0*arithmetic[-1])
+    m = numpy.asarray(m, dtype=float)
+    arithmetic = numpy.ones_like(m)
+    geometric = numpy.sqrt(numpy.where(m < 1.0, 1.0-m, 1.0))
+    weight = 0.5
+    total = weight*m
+    while numpy.any(numpy.abs(arithmetic-geometric) > EPSILON*arithmetic):
+        difference = (arithmetic-geometric)/2.0
+        arithmetic, geometric = (arithmetic+geometric)/2.0, numpy.sqrt(arithmetic*geometric)
+        weight *= 2.0
+        total = total+weight*difference**2
+    return numpy.where(m < 1.0, numpy.pi/(2.0*arithmetic)*(1.0-total), 1.0)
+
+#Incomplete elliptic integral of the second kind E(phi, m), for an array of phi and any phi.
+#E(phi+k*pi, m) = E(phi, m)+2*k*E(m), so phi is first reduced to [-pi/2, pi/2]. Each Landen step then
+#doubles the amplitudes, phi[n+1] = phi[n]+arctan(b[n]/a[n]*tan(phi[n])) on the branch closest to 2*phi[n],
+#until F(phi, m) = phi[N]/(2**N*a[N]) and E(phi, m) = E(m)/K(m)*F(phi, m)+sum(c[n]*sin(phi[n])).
+def incompleteE(phi, m):
+    phi = numpy.asarray(phi, dtype=float)
+    periods = numpy.round(phi/numpy.pi)
+    phi = phi-periods*numpy.pi
+    if m == 1.0:
+        return numpy.sin(phi)+2.0*periods
+    arithmetic, geometric, difference = landenSequence(m)
+    amplitudes = phi
+    total = 0.0
+    for n in range(1, len(arithmetic)):
+        doubled = amplitudes+numpy.arctan(geometric[n-1]/arithmetic[n-1]*numpy.tan(amplitudes))
+        amplitudes = doubled+numpy.pi*numpy.round((2.0*amplitudes-doubled)/numpy.pi)
+        total = total+difference[n]*numpy.sin(amplitudes)
+    ratio = completeRatio(difference)
+    return ratio*amplitudes/(2.0**(len(difference)-1)*arithmetic[-1])+total+periods*ratio*numpy.pi/arithmetic[-1]
+
+#E(phi, m) at the phis of a table over [0, pi/2], by Gauss-Legendre quadrature of each interval.
+#Cheaper than incompleteE and accurate enough for the initial guess of inverseIncompleteE.
+def quadratureTable(table_phis, m):
+    half_widths = numpy.diff(table_phis)/2.0
+    phis = (table_phis[:-1]+half_widths)[:, numpy.newaxis]+half_widths[:, numpy.newaxis]*gauss_nodes
+    speeds = numpy.sqrt(numpy.maximum(1.0-m*numpy.sin(phis)**2, 0.0))
+    return numpy.append(0.0, numpy.cumsum(half_widths*numpy.dot(speeds, gauss_weights)))
+
+#Solve E(phi, m) = values for phi.
+#The reduced values are first interpolated in a table of E over [0, pi/2] by cubic Hermite interpolation
+#of the inverse, with derivative 1/sqrt(1-m*sin(phi)**2), then refined by Newton's method. Steps that
+#would leave the bracketing interval bisect it instead, which only happens close to phi = pi/2 when m
+#is close to 1, where the derivative vanishes. As Newton's method converges quadratically, the error
+#left after a step is about its square times the second over twice the first derivative, and iteration
+#stops as soon as that is below tol for all values, without evaluating E once more.
+def inverseIncompleteE(values, m, complete=None, tol=1e-15, maxiter=64, table_size=32):
+    values = numpy.asarray(values, dtype=float)
+    if complete is None:
+        complete = completeE(m)
+    periods = numpy.round(values/(2.0*complete))
+    reduced = values-2.0*periods*complete
+    signs = numpy.where(reduced < 0.0, -1.0, 1.0)
+    reduced = numpy.minimum(numpy.abs(reduced), complete)
+
+    table_phis = numpy.linspace(0.0, numpy.pi/2.0, table_size+1)
+    table_values = quadratureTable(table_phis, m)
+    table_speeds = numpy.sqrt(numpy.maximum(1.0-m*numpy.sin(table_phis)**2, 0.0))
+    intervals = numpy.clip(numpy.searchsorted(table_values, reduced, side="right")-1, 0, table_size-1)
+    lower = table_phis[intervals]
+    upper = table_phis[intervals+1]
+    widths = table_values[intervals+1]-table_values[intervals]
+    with numpy.errstate(divide="ignore", invalid="ignore"):
+        t = (reduced-table_values[intervals])/widths
+        phis = ((2.0*t**3-3.0*t**2+1.0)*lower+(t**3-2.0*t**2+t)*widths/table_speeds[intervals]
+                +(3.0*t**2-2.0*t**3)*upper+(t**3-t**2)*widths/table_speeds[intervals+1])
+    phis = numpy.clip(numpy.where(numpy.isfinite(phis), phis, lower+t*(upper-lower)), lower, upper)
+
+    #The table is not exact, so the bracket starts out as the whole quarter period
+    lower = numpy.zeros_like(phis)
+    upper = numpy.full_like(phis, numpy.pi/2.0)
+    for iteration in range(maxiter):
+        Profiling.count("inverseIncompleteE.iterations")
+        Profiling.count("inverseIncompleteE.residual_evaluations", phis.size)
+        errors = incompleteE(phis, m)-reduced
+        lower = numpy.where(errors < 0.0, phis, lower)
+        upper = numpy.where(errors > 0.0, phis, upper)
+        sines = numpy.sin(phis)
+        speeds_squared = numpy.maximum(1.0-m*sines**2, 0.0)
+        #Values within rounding error of E are solved, however flat E is there
+        solved = numpy.abs(errors) <= 4.0*EPSILON*complete
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            steps = numpy.where(solved, 0.0, errors/numpy.sqrt(speeds_squared))
+            curvatures = numpy.abs(m*sines*numpy.cos(phis)/(2.0*speeds_squared))
+        new_phis = phis-steps
+        outside = ~((new_phis >= lower) & (new_phis <= upper) | solved)
+        new_phis[outside] = (lower[outside]+upper[outside])/2.0
+        phis = new_phis
+        if not numpy.any(outside):
+            with numpy.errstate(invalid="ignore"):
+                if numpy.all(numpy.where(steps == 0.0, 0.0, curvatures*steps**2) <= tol):
+                    break
+
+    return periods*numpy.pi+signs*phis
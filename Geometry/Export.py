@@ -0,0 +1,205 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Streaming export of DD Shapes geometry to binary PLY, binary STL and NumPy .npz files.
+#The geometry is generated and written a fixed number of vertices at a time, straight from the
+#per-cross-section frames, so the memory used does not grow with the resolution of the shape.
+
+import os
+import struct
+import tempfile
+import zipfile
+import numpy
+from numpy.lib import format as npy_format
+from .Torus import getTorusFrames, getBridgedRings
+from .Spiral import getSpiralFrames
+from .Sweep import getSweepVertices
+from .Topology import getTorusFaceRange, getSpiralTubeFaces, getSpiralCaps
+
+#Number of vertices generated at a time
+CHUNK_VERTICES = 65536
+
+STL_TRIANGLE = numpy.dtype([("normal", "<f4", (3,)),
+                            ("vertices", "<f4", (3, 3)),
+                            ("attribute", "<u2")])
+
+#Split consecutive ranges of count items into chunks of at most size items
+def chunkRanges(count, size):
+    for start in range(0, count, size):
+        yield start, min(start+size, count)
+
+#Streams of the geometry of a shape. Each stream knows its vertex and face counts up front, and yields
+#  vertexChunks: the vertices in order, as (n, 3) arrays,
+#  faceChunks: the faces in order, as (n, vertices per face) arrays of vertex indices,
+#  polygonChunks: the faces in order, together with the vertices they use, as (vertices, faces) pairs
+#                 where the faces index into those vertices.
+#face_sets holds the number of faces and vertices per face of each set of equally sized faces.
+class TorusStream:
+    def __init__(self, arguments, chunk_vertices=CHUNK_VERTICES):
+        self.cross_base, self.ring_vertices, self.cross_transforms, twist_angles = getTorusFrames(**arguments)
+        self.bridged = getBridgedRings(twist_angles)
+        self.ustep = len(self.cross_base)
+        self.vstep = len(self.ring_vertices)
+        self.chunk_rings = max(1, chunk_vertices//self.ustep)
+        self.vertex_count = self.ustep*self.vstep
+        self.face_sets = [(self.ustep*self.vstep, 4)]
+
+    def vertexChunks(self):
+        for start, stop in chunkRanges(self.vstep, self.chunk_rings):
+            yield getSweepVertices(self.cross_base, self.ring_vertices[start:stop], self.cross_transforms[start:stop])
+
+    def faceChunks(self):
+        for start, stop in chunkRanges(self.vstep, self.chunk_rings):
+            yield getTorusFaceRange(self.ustep, self.vstep, self.bridged, start, stop)
+
+    def polygonChunks(self):
+        for start, stop in chunkRanges(self.vstep, self.chunk_rings):
+            #The faces of the last cross-section of the chunk connect to the next one, wrapping around to the first
+            rings = numpy.arange(start, stop+1)%self.vstep
+            vertices = getSweepVertices(self.cross_base, self.ring_vertices[rings], self.cross_transforms[rings])
+            faces = getTorusFaceRange(self.ustep, self.vstep, self.bridged, start, stop)
+            yield vertices, (faces-start*self.ustep)%self.vertex_count
+
+class SpiralStream:
+    def __init__(self, arguments, chunk_vertices=CHUNK_VERTICES):
+        arguments = dict(arguments)
+        cap_fill = arguments.pop("cap_fill")
+        self.cross_vertices, self.spiral_vertices, self.cross_transforms = getSpiralFrames(**arguments)
+        self.cross_segments = len(self.cross_vertices)
+        self.spine_steps = len(self.spiral_vertices)-1
+        self.chunk_rings = max(1, chunk_vertices//self.cross_segments)
+        self.vert_offset = 1 if cap_fill == "cap.fan" else 0
+        self.caps = getSpiralCaps(self.cross_segments, self.spine_steps, cap_fill)
+        self.vertex_count = (self.spine_steps+1)*self.cross_segments+2*self.vert_offset
+        self.face_sets = [(self.spine_steps*self.cross_segments, 4)]
+        if self.caps is not None:
+            self.face_sets = [self.caps[0].shape]+self.face_sets+[self.caps[1].shape]
+
+    def crossSections(self, start, stop):
+        return getSweepVertices(self.cross_vertices, self.spiral_vertices[start:stop], self.cross_transforms[start:stop])
+
+    def vertexChunks(self):
+        if self.vert_offset:
+            yield self.spiral_vertices[:1]
+        for start, stop in chunkRanges(self.spine_steps+1, self.chunk_rings):
+            yield self.crossSections(start, stop)
+        if self.vert_offset:
+            yield self.spiral_vertices[-1:]
+
+    def faceChunks(self):
+        if self.caps is not None:
+            yield self.caps[0]
+        for start, stop in chunkRanges(self.spine_steps, self.chunk_rings):
+            yield getSpiralTubeFaces(self.cross_segments, start, stop, self.vert_offset)
+        if self.caps is not None:
+            yield self.caps[1]
+
+    def polygonChunks(self):
+        if self.caps is not None:
+            yield numpy.concatenate((self.spiral_vertices[:self.vert_offset], self.crossSections(0, 1))), self.caps[0]
+        for start, stop in chunkRanges(self.spine_steps, self.chunk_rings):
+            yield self.crossSections(start, stop+1), getSpiralTubeFaces(self.cross_segments, start, stop, -start*self.cross_segments)
+        if self.caps is not None:
+            end_vertices = numpy.concatenate((self.crossSections(self.spine_steps, self.spine_steps+1),
+                                              self.spiral_vertices[len(self.spiral_vertices)-self.vert_offset:]))
+            yield end_vertices, self.caps[1]-self.spine_steps*self.cross_segments-self.vert_offset
+
+def getFaceCount(stream):
+    return sum(count for count, size in stream.face_sets)
+
+def getLoopCount(stream):
+    return sum(count*size for count, size in stream.face_sets)
+
+def getTriangleCount(stream):
+    return sum(count*max(size-2, 0) for count, size in stream.face_sets)
+
+#Split faces into triangle fans around their first vertex
+def triangulate(faces):
+    triangles = [numpy.stack((faces[:, 0], faces[:, i], faces[:, i+1]), axis=-1) for i in range(1, faces.shape[1]-1)]
+    if not triangles:
+        return numpy.zeros((0, 3), dtype=faces.dtype)
+    return numpy.stack(triangles, axis=1).reshape(-1, 3)
+
+def writePLY(stream, path):
+    max_face_size = max([size for count, size in stream.face_sets] or [0])
+    count_type, count_dtype = ("uchar", "<u1") if max_face_size <= 255 else ("ushort", "<u2")
+    header = "\n".join(("ply",
+                        "format binary_little_endian 1.0",
+                        "comment Generated by DD Shapes",
+                        "element vertex {}".format(stream.vertex_count),
+                        "property float x",
+                        "property float y",
+                        "property float z",
+                        "element face {}".format(getFaceCount(stream)),
+                        "property list {} int vertex_indices".format(count_type),
+                        "end_header"))+"\n"
+    with open(path, "wb") as ply_file:
+        ply_file.write(header.encode("ascii"))
+        for vertices in stream.vertexChunks():
+            ply_file.write(numpy.ascontiguousarray(vertices, dtype="<f4").tobytes())
+        for faces in stream.faceChunks():
+            rows = numpy.zeros(len(faces), dtype=[("count", count_dtype), ("indices", "<i4", (faces.shape[1],))])
+            rows["count"] = faces.shape[1]
+            rows["indices"] = faces
+            ply_file.write(rows.tobytes())
+
+def writeSTL(stream, path):
+    with open(path, "wb") as stl_file:
+        stl_file.write(b"Generated by DD Shapes".ljust(80, b" "))
+        stl_file.write(struct.pack("<I", getTriangleCount(stream)))
+        for vertices, faces in stream.polygonChunks():
+            corners = vertices[triangulate(faces)]
+            normals = numpy.cross(corners[:, 1]-corners[:, 0], corners[:, 2]-corners[:, 0])
+            lengths = numpy.linalg.norm(normals, axis=1)[:, numpy.newaxis]
+            triangles = numpy.zeros(len(corners), dtype=STL_TRIANGLE)
+            triangles["normal"] = numpy.divide(normals, lengths, out=numpy.zeros_like(normals), where=lengths > 0.0)
+            triangles["vertices"] = corners
+            stl_file.write(triangles.tobytes())
+
+#Write the vertices, loops and loop_totals arrays of a shape as an uncompressed .npz archive.
+#Each array is streamed to a temporary .npy file first, as zipfile can only stream from files.
+def writeNPZ(stream, path):
+    arrays = (("vertices", "<f4", (stream.vertex_count, 3), stream.vertexChunks()),
+              ("loops", "<i4", (getLoopCount(stream),), (faces.reshape(-1) for faces in stream.faceChunks())),
+              ("loop_totals", "<i4", (getFaceCount(stream),), (numpy.full(len(faces), faces.shape[1]) for faces in stream.faceChunks())))
+    with tempfile.TemporaryDirectory() as temp_directory:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name, dtype, shape, chunks in arrays:
+                temp_path = os.path.join(temp_directory, name+".npy")
+                with open(temp_path, "wb") as npy_file:
+                    npy_format.write_array_header_1_0(npy_file, {"descr": npy_format.dtype_to_descr(numpy.dtype(dtype)),
+                                                                 "fortran_order": False,
+                                                                 "shape": shape})
+                    for chunk in chunks:
+                        npy_file.write(numpy.ascontiguousarray(chunk, dtype=dtype).tobytes())
+                archive.write(temp_path, name+".npy")
+                os.remove(temp_path)
+
+WRITERS = {"ply": writePLY, "stl": writeSTL, "npz": writeNPZ}
+SHAPE_STREAMS = {"elliptic_torus": TorusStream, "log_spiral": SpiralStream}
+
+#Write a shape to path in the given format, or the format matching the extension of path,
+#from the same arguments as the geometry kernel of the shape. Returns the stream that was written.
+def exportShape(shape, arguments, path, file_format=None, chunk_vertices=CHUNK_VERTICES):
+    if file_format is None:
+        file_format = os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format not in WRITERS:
+        raise ValueError("Unknown export format \"{}\", expected one of {}".format(file_format, ", ".join(sorted(WRITERS))))
+    stream = SHAPE_STREAMS[shape](arguments, chunk_vertices)
+    WRITERS[file_format](stream, path)
+    return stream
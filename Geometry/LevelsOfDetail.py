@@ -0,0 +1,39 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Levels of detail divide the segment counts of a shape by a factor each. When a count is divisible by the factor,
+#and the points of the shape don't depend on how many there are, the points of the level are every factor-th
+#point of the full shape, so they are taken from it instead of being calculated again.
+
+#Parse a comma or whitespace separated list of level of detail factors, giving an empty list for an empty text
+def parseLODFactors(text):
+    try:
+        factors = [int(factor) for factor in text.replace(",", " ").split()]
+    except ValueError:
+        raise ValueError("Level of detail factors must be whole numbers, got \"{}\"".format(text))
+    if any(factor < 1 for factor in factors):
+        raise ValueError("Level of detail factors must be at least 1, got \"{}\"".format(text))
+    return factors
+
+#Number of segments at the level of detail of factor, never less than minimum, unless steps already is
+def getLevelSteps(steps, factor, minimum):
+    return max(min(minimum, steps), steps//factor)
+
+#Whether the level of detail of factor keeps every factor-th of steps segments
+def isNestedLevel(steps, factor, minimum):
+    return steps%factor == 0 and steps//factor >= minimum
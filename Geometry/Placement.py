@@ -0,0 +1,42 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from math import pi, sin, sqrt, ceil
+import numpy
+
+#Locations of count copies of a shape, as a (count, 3) array, placed in the XY plane:
+#  array.grid: row by row on a square grid, starting at the origin, spacing apart,
+#  array.ring: evenly around a circle centered on the origin, with neighbouring copies spacing apart,
+#  array.random: scattered uniformly over a square centered on the origin, leaving about spacing**2 for each copy.
+#The random pattern is the same for the same seed.
+def getArrayLocations(count, pattern, spacing, seed=0):
+    locations = numpy.zeros((count, 3))
+    if pattern == "array.ring":
+        angles = 2*pi*numpy.arange(count)/count
+        radius = spacing/(2*sin(pi/count)) if count > 1 else 0.0
+        locations[:, 0] = radius*numpy.cos(angles)
+        locations[:, 1] = radius*numpy.sin(angles)
+    elif pattern == "array.random":
+        side = spacing*sqrt(count)
+        locations[:, :2] = numpy.random.RandomState(seed).uniform(-side/2, side/2, (count, 2))
+    else:
+        columns = int(ceil(sqrt(count)))
+        indices = numpy.arange(count)
+        locations[:, 0] = spacing*(indices%columns)
+        locations[:, 1] = spacing*(indices//columns)
+    return locations
@@ -0,0 +1,108 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Optional timing instrumentation of the hot paths of the DD Shapes operators and kernels.
+#Wall time and call count of each stage, and counters such as solver iterations, accumulate in a
+#module-level registry until reset. While disabled, stage returns a shared no-op context manager and
+#count returns immediately, so the instrumented code pays next to nothing.
+
+import json
+import time
+from collections import OrderedDict
+
+enabled = False
+
+#Stage name -> [seconds, calls]
+stages = OrderedDict()
+#Counter name -> count
+counters = OrderedDict()
+
+class Stage:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record(self.name, time.perf_counter()-self.start)
+        return False
+
+class NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+NULL_STAGE = NullStage()
+
+#Time a stage with: with Profiling.stage("name"): ...
+def stage(name):
+    if not enabled:
+        return NULL_STAGE
+    return Stage(name)
+
+def record(name, seconds):
+    entry = stages.get(name)
+    if entry is None:
+        stages[name] = [seconds, 1]
+    else:
+        entry[0] += seconds
+        entry[1] += 1
+
+def count(name, amount=1):
+    if enabled:
+        counters[name] = counters.get(name, 0)+amount
+
+def reset():
+    stages.clear()
+    counters.clear()
+
+#Copy of the registry, to report only what happens after this point
+def snapshot():
+    return (dict((name, list(entry)) for name, entry in stages.items()), dict(counters))
+
+#The registry, or what was added to it since a snapshot, as a JSON-compatible dictionary
+def getReport(since=None):
+    since_stages, since_counters = since if since is not None else ({}, {})
+    report = {"stages": OrderedDict(), "counters": OrderedDict()}
+    for name, (seconds, calls) in stages.items():
+        before = since_stages.get(name, (0.0, 0))
+        if calls > before[1]:
+            report["stages"][name] = {"seconds": seconds-before[0], "calls": calls-before[1]}
+    for name, value in counters.items():
+        if value != since_counters.get(name, 0):
+            report["counters"][name] = value-since_counters.get(name, 0)
+    return report
+
+#One line summary of getReport, for operator reports
+def formatReport(since=None):
+    report = getReport(since)
+    parts = ["{}: {:.2f} ms ({}x)".format(name, 1000*entry["seconds"], entry["calls"]) for name, entry in report["stages"].items()]
+    parts += ["{}: {}".format(name, value) for name, value in report["counters"].items()]
+    return "; ".join(parts)
+
+def dumpJSON(path):
+    with open(path, "w") as json_file:
+        json.dump(getReport(), json_file, indent=2)
@@ -0,0 +1,94 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#The parameters of the shapes and their mapping to the arguments of the geometry kernels, shared by the
+#add operators, Regenerate, the batch generator and the benchmarks.
+#Only the functions import the kernels, so that the operators can take their property defaults from here.
+
+from math import pi, sqrt
+
+#Parameters of each shape, which are also the defaults of the properties of the add operators
+SHAPE_DEFAULTS = {
+    "elliptic_torus": {
+        "ring_axes": ((3+sqrt(5))/2, (1+sqrt(5))/2),
+        "vstep": 48,
+        "ring_spacing_type": "spacing.area",
+        "ring_tolerance": 0.001,
+        "cross_axes": ((sqrt(5)-1)/2, (3-sqrt(5))/2),
+        "ustep": 12,
+        "cross_spacing_type": "spacing.area",
+        "cross_tolerance": 0.001,
+        "cross_twist": 0,
+        "cross_twist_amplitude": pi,
+        "cross_twist_type": "twist.linear",
+        "cross_twist_samples": "0, 1, 0, -1",
+        "cross_rotation": 0.0,
+        "tube_thickness_method": "thickness.cross"
+    },
+    "log_spiral": {
+        "turns": 4,
+        "resolution": 4,
+        "initial_radius": 1.0,
+        "radius_scaling": (1+sqrt(5))/2,
+        "cross_segments": 4,
+        "cross_twist": 0.0,
+        "min_thickness": 0.0,
+        "thickness_scaling": 2/(1+sqrt(5)),
+        "cap_fill": "cap.none"
+    }
+}
+
+#Fill in the defaults for the parameters of a shape, rejecting unknown shapes and parameters,
+#giving the arguments for the geometry kernel of the shape
+def getShapeArguments(shape, parameters):
+    if shape not in SHAPE_DEFAULTS:
+        raise ValueError("Unknown shape \"{}\", expected one of {}".format(shape, ", ".join(sorted(SHAPE_DEFAULTS))))
+    unknown = set(parameters)-set(SHAPE_DEFAULTS[shape])
+    if unknown:
+        raise ValueError("Unknown parameters for {}: {}".format(shape, ", ".join(sorted(unknown))))
+    from .Twist import parseTwistSamples
+
+    arguments = dict(SHAPE_DEFAULTS[shape])
+    arguments.update(parameters)
+    if shape == "elliptic_torus":
+        if arguments["cross_twist_type"] != "twist.curve":
+            arguments["cross_twist_samples"] = None
+        elif isinstance(arguments["cross_twist_samples"], str):
+            arguments["cross_twist_samples"] = parseTwistSamples(arguments["cross_twist_samples"])
+    return arguments
+
+#Generate a shape, returning its vertices as a (V, 3) array, and its faces as
+#a flat array of loop vertex indices together with the number of vertices of each face.
+#With lod_factor, the shape is generated at the level of detail of that factor.
+#With surface set, the normals and the texture coordinates of the shape follow.
+def generateShape(shape, parameters, lod_factor=None, surface=False):
+    import numpy
+    from .Torus import getTorusGeometry, getTorusLODGeometry
+    from .Spiral import getSpiralGeometry, getSpiralLODGeometry
+
+    arguments = getShapeArguments(shape, parameters)
+    if shape == "elliptic_torus":
+        if lod_factor is not None:
+            geometry = getTorusLODGeometry([lod_factor], surface=surface, **arguments)[0]
+        else:
+            geometry = getTorusGeometry(surface=surface, **arguments)
+        vertices, faces = geometry[:2]
+        return (vertices, faces.reshape(-1), numpy.full(len(faces), 4, dtype=numpy.int32))+tuple(geometry[2:])
+    if lod_factor is not None:
+        return getSpiralLODGeometry([lod_factor], surface=surface, **arguments)[0]
+    return getSpiralGeometry(surface=surface, **arguments)
@@ -0,0 +1,166 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from math import atan2, pi, log
+import numpy
+from . import Profiling
+from .Topology import getSpiralFaces, getSpiralUVs
+from .Sweep import rotationMatrices, rotationRates, getSweepVertices, getSweepNormals
+from .LevelsOfDetail import getLevelSteps, isNestedLevel
+
+#Fewest cross-section segments, and spine segments per 90 degree turn, at a level of detail
+MIN_LOD_CROSS_SEGMENTS = 3
+MIN_LOD_RESOLUTION = 1
+
+#Angle of the tangent line to the spiral at each theta. Writing the derivatives of the X and Y equations as
+#    x' = -k**(-2*theta/pi)*(2*cos(theta)*log(k)+pi*sin(theta))/pi
+#    y' = k**(-2*theta/pi)*(-2*sin(theta)*log(k)+pi*cos(theta))/pi
+#with k the radius scaling, atan2(-x', y') is theta rotated by the constant angle atan2(2*log(k), pi)
+#between the tangent and the radius of a logarithmic spiral.
+def normalAngles(thetas, radius_scaling):
+    return thetas+atan2(2*log(radius_scaling), pi)
+
+#Calculate the base shape of the cross-sections, the base shape of the spiral,
+#and the transformation of the cross-section at each spiral vertex. With rates set, the derivatives of the
+#spiral vertices and of the transformations with respect to the spine vertex index follow.
+def getSpiralFrames(turns, resolution, initial_radius, radius_scaling,
+                    cross_segments, cross_twist, min_thickness, thickness_scaling, rates=False):
+    spine_steps = resolution*turns
+
+    #Define the base shape of the cross-sections
+    cross_thetas = 2*pi*numpy.arange(cross_segments)/cross_segments
+    cross_vertices = numpy.zeros((cross_segments, 3))
+    cross_vertices[:, 0] = numpy.cos(cross_thetas)
+    cross_vertices[:, 2] = numpy.sin(cross_thetas)
+
+    #Define the base shape of the spiral
+    u = numpy.arange(spine_steps+1)
+    thetas = u*pi/(2*resolution)
+    radii = initial_radius*numpy.power(float(radius_scaling), -u/resolution)
+    spiral_vertices = numpy.zeros((spine_steps+1, 3))
+    spiral_vertices[:, 0] = radii*numpy.cos(thetas)
+    spiral_vertices[:, 1] = radii*numpy.sin(thetas)
+
+    #Rotate each cross-section to the tangent of the spiral, twist it and scale it to the thickness
+    twist_angles = u*pi*cross_twist/(2*resolution)
+    turned = rotationMatrices(normalAngles(thetas, radius_scaling), 2)
+    twisted = rotationMatrices(twist_angles, 1)
+    rotations = numpy.matmul(turned, twisted)
+    thicknesses = radii*thickness_scaling+min_thickness
+    cross_transforms = rotations*thicknesses[:, numpy.newaxis, numpy.newaxis]
+
+    if not rates:
+        return cross_vertices, spiral_vertices, cross_transforms
+
+    #The angles grow linearly with the index, and the radii exponentially
+    theta_rate = pi/(2*resolution)
+    radius_rates = -radii*log(radius_scaling)/resolution
+    spiral_rates = numpy.zeros((spine_steps+1, 3))
+    spiral_rates[:, 0] = radius_rates*numpy.cos(thetas)-radii*theta_rate*numpy.sin(thetas)
+    spiral_rates[:, 1] = radius_rates*numpy.sin(thetas)+radii*theta_rate*numpy.cos(thetas)
+    rotation_rates = (numpy.matmul(rotationRates(normalAngles(thetas, radius_scaling), theta_rate, 2), twisted)
+                      +numpy.matmul(turned, rotationRates(twist_angles, pi*cross_twist/(2*resolution), 1)))
+    transform_rates = (rotation_rates*thicknesses[:, numpy.newaxis, numpy.newaxis]
+                       +rotations*(radius_rates*thickness_scaling)[:, numpy.newaxis, numpy.newaxis])
+
+    return cross_vertices, spiral_vertices, cross_transforms, spiral_rates, transform_rates
+
+#Normal of each loop of a spiral, in the order of getSpiralFaces. The loops of the tube take the normals of the
+#swept surface, and the loops of the caps the normals of the planes of the first and last cross-section.
+def getSpiralLoopNormals(cross_vertices, spiral_vertices, cross_transforms, spiral_rates, transform_rates, cap_fill, loops):
+    #The cross-section is a unit circle, whose derivative is the circle turned by 90 degrees
+    cross_tangents = numpy.zeros_like(cross_vertices)
+    cross_tangents[:, 0] = -cross_vertices[:, 2]
+    cross_tangents[:, 2] = cross_vertices[:, 0]
+    normals = getSweepNormals(cross_vertices, cross_tangents, spiral_rates, cross_transforms, transform_rates)
+    if cap_fill not in ("cap.ngon", "cap.fan"):
+        return normals[loops]
+    #The cross-sections lie in the planes of the first and last column of their transformations,
+    #so their planes are normal to the middle column
+    start_normal, end_normal = cross_transforms[[0, -1], :, 1]
+    start_normal = start_normal/(numpy.linalg.norm(start_normal) or 1.0)
+    end_normal = end_normal/(numpy.linalg.norm(end_normal) or 1.0)
+    #Point the caps away from the tube
+    if numpy.dot(start_normal, spiral_vertices[1]-spiral_vertices[0]) > 0.0:
+        start_normal = -start_normal
+    if numpy.dot(end_normal, spiral_vertices[-1]-spiral_vertices[-2]) < 0.0:
+        end_normal = -end_normal
+    cap_loops = len(cross_vertices)*(3 if cap_fill == "cap.fan" else 1)
+    if cap_fill == "cap.fan":
+        normals = numpy.concatenate((start_normal[numpy.newaxis], normals, end_normal[numpy.newaxis]))
+    loop_normals = normals[loops]
+    loop_normals[:cap_loops] = start_normal
+    loop_normals[-cap_loops:] = end_normal
+    return loop_normals
+
+#Sweep the cross-section along the spiral, giving the vertex array, and the faces as a flat loop index array
+#with the number of vertices of each face. If the derivatives of the spiral frames are given, the normals
+#and the texture coordinates of each loop are returned as well.
+def sweepSpiral(cross_vertices, spiral_vertices, cross_transforms, spiral_rates=None, transform_rates=None, cap_fill="cap.none"):
+    with Profiling.stage("spiral.vertices"):
+        vertices = getSweepVertices(cross_vertices, spiral_vertices, cross_transforms)
+
+        #Add the centers of the caps for the triangle fans
+        if cap_fill == "cap.fan":
+            vertices = numpy.concatenate((spiral_vertices[:1], vertices, spiral_vertices[-1:]))
+
+    with Profiling.stage("spiral.faces"):
+        loops, loop_totals = getSpiralFaces(len(cross_vertices), len(spiral_vertices)-1, cap_fill)
+    if spiral_rates is None:
+        return vertices, loops, loop_totals
+    with Profiling.stage("spiral.surface"):
+        normals = getSpiralLoopNormals(cross_vertices, spiral_vertices, cross_transforms,
+                                       spiral_rates, transform_rates, cap_fill, loops)
+        uvs = getSpiralUVs(len(cross_vertices), len(spiral_vertices)-1, cap_fill)
+    return vertices, loops, loop_totals, normals, uvs
+
+#Create the vertex array, and the faces as a flat loop index array with the number of vertices of each face,
+#of a logarithmic spiral, followed by the normals and texture coordinates of each loop if surface is set
+def getSpiralGeometry(turns, resolution, initial_radius, radius_scaling,
+                      cross_segments, cross_twist, min_thickness, thickness_scaling, cap_fill, surface=False):
+    with Profiling.stage("spiral.transforms"):
+        frames = getSpiralFrames(turns, resolution, initial_radius, radius_scaling,
+                                 cross_segments, cross_twist, min_thickness, thickness_scaling, surface)
+    return sweepSpiral(*frames, cap_fill=cap_fill)
+
+#Create the geometry of a logarithmic spiral at each level of detail, with the resolution and the number of
+#cross-section segments divided by each of factors. The full spiral is calculated once. Levels taking every
+#factor-th spine vertex or cross-section vertex of it reuse its frames or its cross-section.
+#With surface set, each level also holds the normals and texture coordinates of its loops.
+def getSpiralLODGeometry(factors, turns, resolution, initial_radius, radius_scaling,
+                         cross_segments, cross_twist, min_thickness, thickness_scaling, cap_fill, surface=False):
+    with Profiling.stage("spiral.transforms"):
+        full_frames = getSpiralFrames(turns, resolution, initial_radius, radius_scaling,
+                                      cross_segments, cross_twist, min_thickness, thickness_scaling, surface)
+    levels = []
+    for factor in factors:
+        nested_cross = isNestedLevel(cross_segments, factor, MIN_LOD_CROSS_SEGMENTS)
+        nested_spine = isNestedLevel(resolution, factor, MIN_LOD_RESOLUTION)
+        if nested_cross and nested_spine:
+            Profiling.count("spiral.lod.nested_levels")
+            #Every factor-th spine vertex changes factor times as fast per index
+            frames = (full_frames[0][::factor],)+tuple(frame[::factor] for frame in full_frames[1:3])
+            frames += tuple(frame[::factor]*factor for frame in full_frames[3:])
+        else:
+            with Profiling.stage("spiral.transforms"):
+                frames = getSpiralFrames(turns, getLevelSteps(resolution, factor, MIN_LOD_RESOLUTION),
+                                         initial_radius, radius_scaling,
+                                         getLevelSteps(cross_segments, factor, MIN_LOD_CROSS_SEGMENTS),
+                                         cross_twist, min_thickness, thickness_scaling, surface)
+        levels.append(sweepSpiral(*frames, cap_fill=cap_fill))
+    return levels
@@ -0,0 +1,68 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import numpy
+
+#Stack of 3x3 rotation matrices, one for each angle, around the X (0), Y (1) or Z (2) axis
+def rotationMatrices(angles, axis):
+    cos_angles = numpy.cos(angles)
+    sin_angles = numpy.sin(angles)
+    i, j = ((1, 2), (2, 0), (0, 1))[axis]
+    matrices = numpy.zeros((len(cos_angles), 3, 3))
+    matrices[:, axis, axis] = 1.0
+    matrices[:, i, i] = cos_angles
+    matrices[:, j, j] = cos_angles
+    matrices[:, i, j] = -sin_angles
+    matrices[:, j, i] = sin_angles
+    return matrices
+
+#Derivatives of the matrices of rotationMatrices, for angles changing at the given rates
+def rotationRates(angles, rates, axis):
+    cos_rates = numpy.cos(angles)*rates
+    sin_rates = numpy.sin(angles)*rates
+    i, j = ((1, 2), (2, 0), (0, 1))[axis]
+    matrices = numpy.zeros((len(cos_rates), 3, 3))
+    matrices[:, i, i] = -sin_rates
+    matrices[:, j, j] = -sin_rates
+    matrices[:, i, j] = -cos_rates
+    matrices[:, j, i] = cos_rates
+    return matrices
+
+#Put a cross-section at each spine vertex, transformed by the cross-section transformation of that vertex.
+#The vertices are ordered spine vertex by spine vertex, i.e. vertex i*len(cross_base)+j is vertex j of cross-section i.
+def getSweepVertices(cross_base, spine_vertices, cross_transforms):
+    #Transforming all cross-section vertices at once with the transposed matrix is a stacked
+    #matrix product, which is several times faster than the equivalent einsum
+    vertices = numpy.matmul(cross_base, cross_transforms.transpose(0, 2, 1))
+    vertices += spine_vertices[:, numpy.newaxis, :]
+    return vertices.reshape(-1, 3)
+
+#Normals of the swept vertices, in the same order, as the cross product of the derivatives of the surface
+#along the spine and around the cross-section, which points the way the faces are wound.
+#cross_tangents holds the derivative of each cross-section vertex around the cross-section, spine_rates
+#the derivative of each spine vertex along the spine, and transform_rates the derivative of each
+#cross-section transformation along the spine, all with respect to the same parameters.
+#Normals of cross-sections scaled to nothing come out as zero vectors, which Blender replaces
+#by the normals it calculates itself.
+def getSweepNormals(cross_base, cross_tangents, spine_rates, cross_transforms, transform_rates):
+    along = getSweepVertices(cross_base, spine_rates, transform_rates)
+    around = getSweepVertices(cross_tangents, numpy.zeros_like(spine_rates), cross_transforms)
+    normals = numpy.cross(along, around)
+    lengths = numpy.linalg.norm(normals, axis=1)
+    normals[lengths > 0.0] /= lengths[lengths > 0.0, numpy.newaxis]
+    return normals
@@ -0,0 +1,141 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import numpy
+from .Cache import LRUCache
+
+#Face index buffers already built. They only depend on the segment counts and the way the
+#segments are bridged or capped, so they are reused as long as those stay the same.
+topology_cache = LRUCache(16)
+
+def readOnly(values):
+    values.flags.writeable = False
+    return values
+
+#Quads connecting cross-sections start to stop-1 of a torus with the next cross-section,
+#as an (ustep*(stop-start), 4) array. bridged holds, for each ring vertex, whether the bridge
+#to the next cross-section is offset by half a turn, which is done when the angle between
+#consecutive cross-sections is obtuse.
+def getTorusFaceRange(ustep, vstep, bridged, start, stop):
+    v = numpy.arange(start, stop, dtype=numpy.int32)[:, numpy.newaxis]
+    u = numpy.arange(ustep, dtype=numpy.int32)[numpy.newaxis, :]
+    next_v = (v+1)%vstep
+    u_bridge = (u+numpy.where(bridged[start:stop], ustep//2, 0)[:, numpy.newaxis])%ustep
+    faces = numpy.stack((v*ustep+u,
+                         next_v*ustep+u_bridge,
+                         next_v*ustep+(u_bridge+1)%ustep,
+                         v*ustep+(u+1)%ustep), axis=-1)
+    return faces.reshape(-1, 4).astype(numpy.int32)
+
+#All the quads of a torus, as an (ustep*vstep, 4) array
+def getTorusFaces(ustep, vstep, bridged):
+    bridged = numpy.asarray(bridged, dtype=bool)
+    key = ("torus", ustep, vstep, bridged.tobytes())
+    faces = topology_cache.get(key)
+    if faces is None:
+        faces = readOnly(getTorusFaceRange(ustep, vstep, bridged, 0, vstep))
+        topology_cache.put(key, faces)
+    return faces
+
+#Quads of tube segments start to stop-1 of a spiral, with cross_segments vertices per cross-section,
+#as an (cross_segments*(stop-start), 4) array. vert_offset is the number of vertices before the first cross-section.
+def getSpiralTubeFaces(cross_segments, start, stop, vert_offset):
+    u = numpy.arange(start, stop, dtype=numpy.int32)[:, numpy.newaxis]
+    v = numpy.arange(cross_segments, dtype=numpy.int32)[numpy.newaxis, :]
+    next_v = (v+1)%cross_segments
+    faces = numpy.stack((u*cross_segments+v,
+                         (u+1)*cross_segments+v,
+                         (u+1)*cross_segments+next_v,
+                         u*cross_segments+next_v), axis=-1)
+    return faces.reshape(-1, 4).astype(numpy.int32)+vert_offset
+
+#The faces filling the start and the end of a spiral tube of spine_steps segments, as two (faces, vertices) arrays,
+#or None if the ends are left open. With triangle fans, the first and last vertex are the centers of the caps.
+def getSpiralCaps(cross_segments, spine_steps, cap_fill):
+    end_vertex = (spine_steps+1)*cross_segments
+    v = numpy.arange(cross_segments, dtype=numpy.int32)
+    next_v = (v+1)%cross_segments
+    if cap_fill == "cap.ngon":
+        start_cap = v[numpy.newaxis, :]
+        end_cap = end_vertex-1-v[numpy.newaxis, :]
+    elif cap_fill == "cap.fan":
+        start_cap = numpy.stack((numpy.zeros_like(v), v+1, next_v+1), axis=-1)
+        end_cap = numpy.stack((numpy.full_like(v, end_vertex+1), end_vertex-v, end_vertex-next_v), axis=-1)
+    else:
+        return None
+    return start_cap, end_cap
+
+#All the faces of a spiral, as a flat array of loop vertex indices and the number of vertices of each face
+def getSpiralFaces(cross_segments, spine_steps, cap_fill):
+    key = ("spiral", cross_segments, spine_steps, cap_fill)
+    topology = topology_cache.get(key)
+    if topology is None:
+        vert_offset = 1 if cap_fill == "cap.fan" else 0
+        face_sets = [getSpiralTubeFaces(cross_segments, 0, spine_steps, vert_offset)]
+        caps = getSpiralCaps(cross_segments, spine_steps, cap_fill)
+        if caps is not None:
+            face_sets = [caps[0]]+face_sets+[caps[1]]
+        loops = numpy.concatenate([faces.reshape(-1) for faces in face_sets])
+        loop_totals = numpy.concatenate([numpy.full(len(faces), faces.shape[1]) for faces in face_sets])
+        topology = (readOnly(loops.astype(numpy.int32)), readOnly(loop_totals.astype(numpy.int32)))
+        topology_cache.put(key, topology)
+    return topology
+
+#Texture coordinates of the corners of quads on a grid of columns by rows segments, in the
+#order of the loops of getTorusFaceRange and getSpiralTubeFaces, as a (columns*rows*4, 2) array.
+#Rows advance along the first texture coordinate and columns along the second, both from 0 to 1,
+#so the last quads of a closed grid end at 1 rather than wrapping back to 0.
+def getGridUVs(columns, rows):
+    row = numpy.arange(rows, dtype=numpy.float32)[:, numpy.newaxis, numpy.newaxis]
+    column = numpy.arange(columns, dtype=numpy.float32)[numpy.newaxis, :, numpy.newaxis]
+    row_offset = numpy.array([0, 1, 1, 0], dtype=numpy.float32)
+    column_offset = numpy.array([0, 0, 1, 1], dtype=numpy.float32)
+    uvs = numpy.stack(numpy.broadcast_arrays((row+row_offset)/rows, (column+column_offset)/columns), axis=-1)
+    return uvs.reshape(-1, 2)
+
+#Texture coordinates of all the loops of a torus
+def getTorusUVs(ustep, vstep):
+    key = ("torus.uv", ustep, vstep)
+    uvs = topology_cache.get(key)
+    if uvs is None:
+        uvs = readOnly(getGridUVs(ustep, vstep))
+        topology_cache.put(key, uvs)
+    return uvs
+
+#Texture coordinates of all the loops of a spiral, in the order of getSpiralFaces.
+#The caps are mapped onto a disc filling the texture.
+def getSpiralUVs(cross_segments, spine_steps, cap_fill):
+    key = ("spiral.uv", cross_segments, spine_steps, cap_fill)
+    uvs = topology_cache.get(key)
+    if uvs is None:
+        uv_sets = [getGridUVs(cross_segments, spine_steps)]
+        if cap_fill in ("cap.ngon", "cap.fan"):
+            angles = numpy.arange(cross_segments)*2.0*numpy.pi/cross_segments
+            rim = 0.5+0.5*numpy.stack((numpy.cos(angles), numpy.sin(angles)), axis=-1)
+            if cap_fill == "cap.ngon":
+                start_cap = rim
+                end_cap = rim[::-1]
+            else:
+                center = numpy.full((cross_segments, 1, 2), 0.5)
+                next_rim = numpy.roll(rim, -1, axis=0)
+                start_cap = numpy.concatenate((center, rim[:, numpy.newaxis], next_rim[:, numpy.newaxis]), axis=1)
+                end_cap = numpy.concatenate((center, rim[::-1, numpy.newaxis], numpy.roll(rim[::-1], -1, axis=0)[:, numpy.newaxis]), axis=1)
+            uv_sets = [start_cap.reshape(-1, 2)]+uv_sets+[end_cap.reshape(-1, 2)]
+        uvs = readOnly(numpy.concatenate(uv_sets).astype(numpy.float32))
+        topology_cache.put(key, uvs)
+    return uvs
@@ -0,0 +1,210 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import numpy
+from . import Profiling
+from .Ellipse import getParamAndNormal, getParamRates, NESTED_SPACING_TYPES
+from .Topology import getTorusFaces, getTorusUVs
+from .Twist import getTwistProfile, getTwistRates
+from .Sweep import rotationMatrices, rotationRates, getSweepVertices, getSweepNormals
+from .LevelsOfDetail import getLevelSteps, isNestedLevel
+
+#Fewest segments of the ring and the cross-section at a level of detail
+MIN_LOD_STEPS = 3
+
+#Calculate the base shape of the cross-section
+def getCrossBase(cross_axes, ustep, cross_spacing_type, cross_tolerance=None):
+    cross_params, cross_normals = getParamAndNormal(cross_axes[0], cross_axes[1], ustep, cross_spacing_type, cross_tolerance)
+    cross_params = numpy.asarray(cross_params, dtype=float)
+    #The adaptive spacing decides the number of segments itself
+    cross_base = numpy.zeros((len(cross_params), 3))
+    cross_base[:, 0] = cross_axes[0]*numpy.cos(cross_params)
+    cross_base[:, 2] = cross_axes[1]*numpy.sin(cross_params)
+    return cross_base
+
+#Calculate the tangents of the base shape of the cross-section, the derivatives of its vertices with respect to the parameter
+def getCrossTangents(cross_axes, ustep, cross_spacing_type, cross_tolerance=None):
+    cross_params = numpy.asarray(getParamAndNormal(cross_axes[0], cross_axes[1], ustep, cross_spacing_type, cross_tolerance)[0], dtype=float)
+    cross_tangents = numpy.zeros((len(cross_params), 3))
+    cross_tangents[:, 0] = -cross_axes[0]*numpy.sin(cross_params)
+    cross_tangents[:, 2] = cross_axes[1]*numpy.cos(cross_params)
+    return cross_tangents
+
+#Calculate the base shape of the ring, the transformation of the cross-section at each ring vertex,
+#and the twist angle at each ring vertex. With rates set, the derivatives of the ring vertices and of the
+#transformations with respect to the position along the ring, which runs from 0 to 1, follow.
+def getRingFrames(ring_axes, vstep, ring_spacing_type,
+                  cross_twist, cross_twist_amplitude, cross_twist_type,
+                  cross_rotation, tube_thickness_method,
+                  cross_twist_samples=None, ring_tolerance=None, rates=False):
+    ring_params, ring_normals = getParamAndNormal(ring_axes[0], ring_axes[1], vstep, ring_spacing_type, ring_tolerance)
+    ring_params = numpy.asarray(ring_params, dtype=float)
+    #The adaptive spacing decides the number of segments itself
+    vstep = len(ring_params)
+
+    #Create the base shape of the ring
+    ring_vertices = numpy.zeros((vstep, 3))
+    ring_vertices[:, 0] = ring_axes[0]*numpy.cos(ring_params)
+    ring_vertices[:, 1] = ring_axes[1]*numpy.sin(ring_params)
+
+    #Calculate the cross-section transformation matrix for each of the vertices of the ring
+    with Profiling.stage("torus.transforms"):
+        twist_angles = getTwistProfile(cross_twist,
+                                       cross_twist_amplitude,
+                                       cross_twist_type,
+                                       vstep,
+                                       cross_twist_samples)
+        twisted = rotationMatrices(cross_rotation+twist_angles, 1)
+        scales = numpy.ones(vstep)
+        if tube_thickness_method == "thickness.tube":
+            #Half the angle between the two edges meeting at each ring vertex
+            to_prev = ring_vertices-numpy.roll(ring_vertices, 1, axis=0)
+            to_next = ring_vertices-numpy.roll(ring_vertices, -1, axis=0)
+            cos_angles = numpy.sum(to_prev*to_next, axis=1)/(numpy.linalg.norm(to_prev, axis=1)*numpy.linalg.norm(to_next, axis=1))
+            angles = numpy.arccos(numpy.clip(cos_angles, -1.0, 1.0))/2.0
+            scales = 1.0/numpy.sin(angles)
+        scaled = twisted.copy()
+        scaled[:, 0, :] *= scales[:, numpy.newaxis]
+        turned = rotationMatrices(ring_normals, 2)
+        cross_transforms = numpy.matmul(turned, scaled)
+
+    if not rates:
+        return ring_vertices, cross_transforms, twist_angles
+
+    #Differentiate the ring, turned by the ring normals, scaled along the ring normals and twisted,
+    #with respect to the position along the ring
+    with Profiling.stage("torus.rates"):
+        param_rates = getParamRates(ring_params, ring_axes[0], ring_axes[1], ring_spacing_type)
+        ring_rates = numpy.zeros((vstep, 3))
+        ring_rates[:, 0] = -ring_axes[0]*numpy.sin(ring_params)*param_rates
+        ring_rates[:, 1] = ring_axes[1]*numpy.cos(ring_params)*param_rates
+        #The normal angle atan2(major*sin(t), minor*cos(t)) changes at major*minor/(major**2*sin(t)**2+minor**2*cos(t)**2)
+        denominators = (ring_axes[0]*numpy.sin(ring_params))**2+(ring_axes[1]*numpy.cos(ring_params))**2
+        safe = numpy.where(denominators > 0.0, denominators, 1.0)
+        normal_rates = numpy.where(denominators > 0.0, ring_axes[0]*ring_axes[1]/safe, 0.0)*param_rates
+        twist_rates = rotationRates(cross_rotation+twist_angles, getTwistRates(cross_twist,
+                                                                                 cross_twist_amplitude,
+                                                                                 cross_twist_type,
+                                                                                 vstep,
+                                                                                 cross_twist_samples), 1)
+        #The tube thickness scaling only exists at the ring vertices, so it is differentiated by central differences
+        scale_rates = (numpy.roll(scales, -1)-numpy.roll(scales, 1))*vstep/2.0
+        scaled_rates = twist_rates*scales[:, numpy.newaxis, numpy.newaxis]
+        scaled_rates[:, 0, :] += twisted[:, 0, :]*scale_rates[:, numpy.newaxis]
+        transform_rates = (numpy.matmul(rotationRates(ring_normals, normal_rates, 2), scaled)
+                           +numpy.matmul(turned, scaled_rates))
+
+    return ring_vertices, cross_transforms, twist_angles, ring_rates, transform_rates
+
+#Calculate the base shape of the cross-section, the base shape of the ring,
+#the transformation of the cross-section at each ring vertex, and the twist angle at each ring vertex,
+#followed by the derivatives of getRingFrames if rates is set
+def getTorusFrames(ring_axes, vstep, ring_spacing_type,
+                   cross_axes, ustep, cross_spacing_type,
+                   cross_twist, cross_twist_amplitude, cross_twist_type,
+                   cross_rotation, tube_thickness_method,
+                   cross_twist_samples=None, ring_tolerance=None, cross_tolerance=None, rates=False):
+    cross_base = getCrossBase(cross_axes, ustep, cross_spacing_type, cross_tolerance)
+    ring_frames = getRingFrames(ring_axes, vstep, ring_spacing_type,
+                                cross_twist, cross_twist_amplitude, cross_twist_type,
+                                cross_rotation, tube_thickness_method,
+                                cross_twist_samples, ring_tolerance, rates)
+    return (cross_base,)+ring_frames
+
+#Whether the bridge from each cross-section to the next is offset by half a turn,
+#which is done if the angle between the two is obtuse
+def getBridgedRings(twist_angles):
+    return numpy.cos(numpy.roll(twist_angles, -1)-twist_angles) < 0.0
+
+#Sweep the cross-section along the ring, giving the vertex and face arrays of the torus.
+#If the tangents of the cross-section and the derivatives of the ring frames are given, the normal
+#of each vertex and the texture coordinates of each loop are returned as well.
+def sweepTorus(cross_base, ring_vertices, cross_transforms, twist_angles,
+               ring_rates=None, transform_rates=None, cross_tangents=None):
+    with Profiling.stage("torus.vertices"):
+        vertices = getSweepVertices(cross_base, ring_vertices, cross_transforms)
+    with Profiling.stage("torus.faces"):
+        faces = getTorusFaces(len(cross_base), len(ring_vertices), getBridgedRings(twist_angles))
+    if cross_tangents is None:
+        return vertices, faces
+    with Profiling.stage("torus.surface"):
+        normals = getSweepNormals(cross_base, cross_tangents, ring_rates, cross_transforms, transform_rates)
+        uvs = getTorusUVs(len(cross_base), len(ring_vertices))
+    return vertices, faces, normals, uvs
+
+#Create the vertex and face arrays of an elliptic torus, followed by its
+#vertex normals and loop texture coordinates if surface is set
+def getTorusGeometry(ring_axes, vstep, ring_spacing_type,
+                     cross_axes, ustep, cross_spacing_type,
+                     cross_twist, cross_twist_amplitude, cross_twist_type,
+                     cross_rotation, tube_thickness_method,
+                     cross_twist_samples=None, ring_tolerance=None, cross_tolerance=None, surface=False):
+    frames = getTorusFrames(ring_axes, vstep, ring_spacing_type,
+                            cross_axes, ustep, cross_spacing_type,
+                            cross_twist, cross_twist_amplitude, cross_twist_type,
+                            cross_rotation, tube_thickness_method,
+                            cross_twist_samples, ring_tolerance, cross_tolerance, surface)
+    cross_tangents = getCrossTangents(cross_axes, ustep, cross_spacing_type, cross_tolerance) if surface else None
+    return sweepTorus(*frames, cross_tangents=cross_tangents)
+
+#Create the vertex and face arrays of an elliptic torus at each level of detail, with the segment counts divided
+#by each of factors, and the tolerances of the adaptive spacing multiplied by the square of each factor.
+#The full torus is calculated once. Levels taking every factor-th point of it reuse its cross-section,
+#and, unless the cross-sections are scaled by the angles between the ring edges, its ring frames,
+#whose derivatives with respect to the position along the ring are the same at every level.
+#With surface set, each level also holds its vertex normals and loop texture coordinates.
+#The levels are yielded one at a time, as they are built.
+def iterTorusLODGeometry(factors, ring_axes, vstep, ring_spacing_type,
+                        cross_axes, ustep, cross_spacing_type,
+                        cross_twist, cross_twist_amplitude, cross_twist_type,
+                        cross_rotation, tube_thickness_method,
+                        cross_twist_samples=None, ring_tolerance=None, cross_tolerance=None, surface=False):
+    frames = getTorusFrames(ring_axes, vstep, ring_spacing_type,
+                            cross_axes, ustep, cross_spacing_type,
+                            cross_twist, cross_twist_amplitude, cross_twist_type,
+                            cross_rotation, tube_thickness_method,
+                            cross_twist_samples, ring_tolerance, cross_tolerance, surface)
+    cross_base, ring_frames = frames[0], frames[1:]
+    cross_tangents = getCrossTangents(cross_axes, ustep, cross_spacing_type, cross_tolerance) if surface else None
+    ustep = len(cross_base)
+    vstep = len(ring_frames[0])
+    for factor in factors:
+        if cross_spacing_type in NESTED_SPACING_TYPES and isNestedLevel(ustep, factor, MIN_LOD_STEPS):
+            Profiling.count("torus.lod.nested_cross_sections")
+            level_cross_base = cross_base[::factor]
+            level_cross_tangents = cross_tangents[::factor] if surface else None
+        else:
+            level_ustep = getLevelSteps(ustep, factor, MIN_LOD_STEPS)
+            level_tolerance = cross_tolerance*factor**2 if cross_tolerance is not None else None
+            level_cross_base = getCrossBase(cross_axes, level_ustep, cross_spacing_type, level_tolerance)
+            level_cross_tangents = getCrossTangents(cross_axes, level_ustep, cross_spacing_type, level_tolerance) if surface else None
+        if (ring_spacing_type in NESTED_SPACING_TYPES and isNestedLevel(vstep, factor, MIN_LOD_STEPS)
+                and tube_thickness_method != "thickness.tube"):
+            Profiling.count("torus.lod.nested_rings")
+            level_ring_frames = tuple(ring_frame[::factor] for ring_frame in ring_frames)
+        else:
+            level_ring_frames = getRingFrames(ring_axes, getLevelSteps(vstep, factor, MIN_LOD_STEPS), ring_spacing_type,
+                                              cross_twist, cross_twist_amplitude, cross_twist_type,
+                                              cross_rotation, tube_thickness_method,
+                                              cross_twist_samples, ring_tolerance*factor**2 if ring_tolerance is not None else None,
+                                              surface)
+        yield sweepTorus(level_cross_base, *level_ring_frames, cross_tangents=level_cross_tangents)
+
+#The levels of iterTorusLODGeometry as a list
+def getTorusLODGeometry(factors, *arguments, **keywords):
+    return list(iterTorusLODGeometry(factors, *arguments, **keywords))
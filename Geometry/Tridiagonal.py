@@ -0,0 +1,62 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Solvers of the tridiagonal systems of the Newton iterations of the "Equal Edge Length" spacing.
+#They are loaded through the Backends registry, so the SciPy one is only imported when it is selected.
+
+import numpy
+
+#Solve the tridiagonal system lower[i-1]*x[i-1]+diagonal[i]*x[i]+upper[i]*x[i+1] = rhs[i]
+#by parallel cyclic reduction: every pass eliminates the neighbours at twice the distance of the previous
+#one from all equations at once, so only log2(n) vectorized passes are needed.
+#Like the Thomas algorithm, it needs no pivoting for diagonally dominant systems.
+def solveTridiagonal(lower, diagonal, upper, rhs):
+    size = len(diagonal)
+    #Identity equations on both sides, so that neighbours beyond the ends need no special case
+    padding = 1 << max(size-1, 0).bit_length()
+    body = slice(padding, padding+size)
+    lower_padded, upper_padded, rhs_padded = numpy.zeros((3, size+2*padding))
+    diagonal_padded = numpy.ones(size+2*padding)
+    lower_padded[padding+1:padding+size] = lower
+    diagonal_padded[body] = diagonal
+    upper_padded[padding:padding+size-1] = upper
+    rhs_padded[body] = rhs
+
+    stride = 1
+    while stride < size:
+        before = slice(padding-stride, padding+size-stride)
+        after = slice(padding+stride, padding+size+stride)
+        before_factors = lower_padded[body]/diagonal_padded[before]
+        after_factors = upper_padded[body]/diagonal_padded[after]
+        diagonal_padded[body] -= before_factors*upper_padded[before]+after_factors*lower_padded[after]
+        rhs_padded[body] -= before_factors*rhs_padded[before]+after_factors*rhs_padded[after]
+        new_lower = -before_factors*lower_padded[before]
+        upper_padded[body] = -after_factors*upper_padded[after]
+        lower_padded[body] = new_lower
+        stride *= 2
+    return rhs_padded[body]/diagonal_padded[body]
+
+#Wrap scipy.linalg.solve_banded with the signature of solveTridiagonal
+def bandedSolver(solve_banded):
+    def solveBanded(lower, diagonal, upper, rhs):
+        bands = numpy.zeros((3, len(diagonal)))
+        bands[0, 1:] = upper
+        bands[1] = diagonal
+        bands[2, :-1] = lower
+        return solve_banded((1, 1), bands, rhs)
+    return solveBanded
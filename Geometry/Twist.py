@@ -0,0 +1,73 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from math import pi
+import numpy
+
+#Parse a comma or whitespace separated list of twist curve samples
+def parseTwistSamples(text):
+    try:
+        samples = [float(sample) for sample in text.replace(",", " ").split()]
+    except ValueError:
+        raise ValueError("Twist curve samples must be numbers, got \"{}\"".format(text))
+    if not samples:
+        raise ValueError("The twist curve needs at least one sample")
+    return numpy.array(samples)
+
+#Twist angle of the cross-section at each of the steps positions along the ring.
+#For sampled curves, samples holds the twist angles, as fractions of the amplitude,
+#at equally spaced positions over one twist, which are linearly interpolated and repeated for each twist.
+def getTwistProfile(twist, amplitude, twist_type, steps, samples=None):
+    positions = numpy.arange(steps)/steps
+    if twist_type == "twist.sine":
+        twist_angles = amplitude*numpy.sin(twist*2*pi*positions)
+    elif twist_type == "twist.sincn":
+        twist_angles = amplitude*numpy.sinc(twist*(2*positions-1.0))
+    elif twist_type == "twist.sinc":
+        twist_angles = amplitude*numpy.sinc(twist*(2*positions-1.0)/pi)
+    elif twist_type == "twist.curve":
+        samples = numpy.asarray(samples, dtype=float)
+        sample_positions = numpy.arange(len(samples)+1)/len(samples)
+        twist_angles = amplitude*numpy.interp(numpy.mod(twist*positions, 1.0),
+                                              sample_positions,
+                                              numpy.append(samples, samples[0]))
+    else:
+        twist_angles = amplitude*twist*positions
+    return twist_angles
+
+#Derivative of the twist angles of getTwistProfile with respect to the position along the ring, which runs from 0 to 1.
+#The sampled curve is piecewise linear, so its derivative is the slope of the segment each position starts.
+def getTwistRates(twist, amplitude, twist_type, steps, samples=None):
+    positions = numpy.arange(steps)/steps
+    if twist_type == "twist.sine":
+        twist_rates = amplitude*twist*2*pi*numpy.cos(twist*2*pi*positions)
+    elif twist_type in ("twist.sincn", "twist.sinc"):
+        scale = 1.0 if twist_type == "twist.sincn" else 1.0/pi
+        x = twist*(2*positions-1.0)*scale
+        #d/dx sin(pi*x)/(pi*x), which is 0 at x = 0
+        safe_x = numpy.where(x == 0.0, 1.0, x)
+        sinc_rates = numpy.where(x == 0.0, 0.0, (numpy.cos(pi*x)-numpy.sinc(x))/safe_x)
+        twist_rates = amplitude*sinc_rates*2*twist*scale
+    elif twist_type == "twist.curve":
+        samples = numpy.asarray(samples, dtype=float)
+        segments = numpy.floor(numpy.mod(twist*positions, 1.0)*len(samples)).astype(int)%len(samples)
+        slopes = (numpy.roll(samples, -1)-samples)*len(samples)
+        twist_rates = amplitude*twist*slopes[segments]
+    else:
+        twist_rates = numpy.full(steps, amplitude*twist, dtype=float)
+    return twist_rates
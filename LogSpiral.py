@@ -30,9 +30,14 @@ bl_info = {
 
 import bpy
 from bpy.types import Operator
-from bpy.props import IntProperty, FloatProperty, EnumProperty
-from math import sin, cos, atan2, pi, log, sqrt
-from mathutils import Vector, Matrix
+from bpy.props import IntProperty, FloatProperty, EnumProperty, StringProperty, BoolProperty
+from math import pi
+from .Geometry import Profiling
+from .Geometry.Shapes import SHAPE_DEFAULTS
+from .Regenerate import getOperatorParameters, splitSurfaceOptions
+from .ShapeObjects import getArrayPatterns, createShapeObjects
+
+SPIRAL_DEFAULTS = SHAPE_DEFAULTS["log_spiral"]
 
 class MESH_OT_log_spiral_add(Operator):
     bl_idname = "mesh.log_spiral_add"
@@ -57,33 +62,33 @@ class MESH_OT_log_spiral_add(Operator):
     #Define properties
     turns = IntProperty(name="Turns",
                         description="Number of 90 degree turns",
-                        default=4,
+                        default=SPIRAL_DEFAULTS["turns"],
                         min=1)
     resolution = IntProperty(name="Resolution",
                              description="Number of segments for each 90 degree turn",
-                             default=4,
+                             default=SPIRAL_DEFAULTS["resolution"],
                              min=1,
                              max=16)
     initial_radius = FloatProperty(name="Initial Radius",
                                    description="Initial radius of the spiral",
-                                   default=1.0,
+                                   default=SPIRAL_DEFAULTS["initial_radius"],
                                    min=0.01,
                                    step=1,
                                    precision=2)
     radius_scaling = FloatProperty(name="Radius Scaling",
                                    description="Factor by which the radius shrinks for each 90 degree turn",
-                                   default=(1+sqrt(5))/2,
+                                   default=SPIRAL_DEFAULTS["radius_scaling"],
                                    min=0.01,
                                    step=1,
                                    precision=2)
     cross_segments = IntProperty(name="Cross-Section Segments",
                                  description="Number of segments of the cross-section",
-                                 default=4,
+                                 default=SPIRAL_DEFAULTS["cross_segments"],
                                  min=1,
                                  max=256)
     cross_twist = FloatProperty(name="Cross-Section Twist",
                                 description="The amount to twist the cross-sections for each 90 degree turn of the spiral",
-                                default=0.0,
+                                default=SPIRAL_DEFAULTS["cross_twist"],
                                 soft_min=-pi/2.0,
                                 soft_max=pi/2.0,
                                 step=10,
@@ -91,14 +96,14 @@ class MESH_OT_log_spiral_add(Operator):
                                 subtype="ANGLE")
     min_thickness = FloatProperty(name="Minimum Thickness",
                                   description="The tube radius at spiral radius 0.0",
-                                  default=0.0,
+                                  default=SPIRAL_DEFAULTS["min_thickness"],
                                   min=0.0,
                                   soft_max=2.5,
                                   step=1,
                                   precision=2)
     thickness_scaling = FloatProperty(name="Thickness Scaling",
                                       description="Cross-section thickness as a fraction of spiral radius",
-                                      default=2/(1+sqrt(5)),
+                                      default=SPIRAL_DEFAULTS["thickness_scaling"],
                                       min=0.0,
                                       max=1.0,
                                       step=1,
@@ -106,93 +111,85 @@ class MESH_OT_log_spiral_add(Operator):
     cap_fill = EnumProperty(items=getCapFillTypes,
                             name="Cap Fill Type",
                             description="How to fill the ends of the tube")
-
-    #Function definitions
-    #Derivative of the X equation for the spiral
-    def xDerivative(self, theta):
-        return -self.radius_scaling**(-2*theta/pi)*(2*cos(theta)*log(self.radius_scaling)+pi*sin(theta))/pi
-
-    #Derivative of the Y equation for the spiral
-    def yDerivative(self, theta):
-        return self.radius_scaling**(-2*theta/pi)*(-2*sin(theta)*log(self.radius_scaling)+pi*cos(theta))/pi
-
-    #Angle of the tangent line to the spiral
-    def normalAngle(self, theta):
-        return atan2(-self.xDerivative(theta), self.yDerivative(theta))
-
-    #Create the mesh
+    lod_factors = StringProperty(name="Levels of Detail",
+                                 description="Factors to divide the resolution and the cross-section segments by, one mesh per level, grouped under an empty. Leave empty for a single mesh",
+                                 default="")
+    use_normals = BoolProperty(name="Analytic Normals",
+                               description="Shade the mesh smooth with custom split normals calculated from the shape",
+                               default=False)
+    use_uvs = BoolProperty(name="UV Map",
+                           description="Add a UV map following the segments of the shape",
+                           default=False)
+    array_count = IntProperty(name="Array Count",
+                              description="Number of copies of the shape, all sharing the same mesh",
+                              default=1,
+                              min=1,
+                              soft_max=1000,
+                              max=100000)
+    array_pattern = EnumProperty(items=getArrayPatterns,
+                                 name="Array Pattern",
+                                 description="How to place the copies of the shape")
+    array_spacing = FloatProperty(name="Array Spacing",
+                                  description="Distance between neighbouring copies of the shape",
+                                  default=4.0,
+                                  min=0.0,
+                                  soft_max=100.0,
+                                  step=10,
+                                  precision=2,
+                                  subtype="DISTANCE")
+    array_seed = IntProperty(name="Array Seed",
+                             description="Seed of the random array pattern",
+                             default=0,
+                             min=0)
+
+    #Create the mesh, timing each stage if profiling is enabled
     def execute(self, context):
-
-        #Initial values
-        cross_vertices = []
-        cross_transform = []
-        spiral_vertices = []
-        vertices = []
-        faces = []
-
-        #Define the base shape of the cross-sections
-        for v in range(self.cross_segments):
-            theta = 2*v*pi/self.cross_segments
-            x = cos(theta)
-            y = 0.0
-            z = sin(theta)
-            cross_vertices.append(Vector((x, y, z)))
-
-        #Define the base shape of the spiral
-        for u in range(self.resolution*self.turns+1):
-            theta = u*pi/(2*self.resolution)
-            r = self.initial_radius*self.radius_scaling**(-u/self.resolution)
-            x = r*cos(theta)
-            y = r*sin(theta)
-            z = 0.0
-            spiral_vertices.append(Vector((x, y, z)))
-            twist_angle = u*pi*self.cross_twist/(2*self.resolution)
-            scale = Matrix().Scale(r*self.thickness_scaling+self.min_thickness, 4)
-            rotation = Matrix().Rotation(self.normalAngle(theta), 4, Vector((0.0, 0.0, 1.0)))
-            twist = Matrix().Rotation(twist_angle, 4, Vector((0.0, 1.0, 0.0)))
-            cross_transform.append(rotation*twist*scale)
-
-        if self.cap_fill == "cap.fan":
-            vert_offset = 1
+        profile = Profiling.snapshot() if Profiling.enabled else None
+        with Profiling.stage("LogSpiral.execute"):
+            result = self.generate(context)
+        if profile is not None:
+            self.report({"INFO"}, Profiling.formatReport(profile))
+        return result
+
+    def generate(self, context):
+        from .Geometry.Spiral import getSpiralGeometry, getSpiralLODGeometry
+        from .Geometry.Shapes import getShapeArguments
+        from .Geometry.LevelsOfDetail import parseLODFactors
+        from .Geometry.Placement import getArrayLocations
+        from .MeshBuilder import fillMesh
+
+        parameters = getOperatorParameters(self, "log_spiral")
+        try:
+            arguments = getShapeArguments("log_spiral", splitSurfaceOptions(parameters)[0])
+            lod_factors = parseLODFactors(self.lod_factors)
+        except ValueError as error:
+            self.report({"ERROR"}, str(error))
+            return {"CANCELLED"}
+        surface = self.use_normals or self.use_uvs
+        if lod_factors:
+            levels = getSpiralLODGeometry(lod_factors, surface=surface, **arguments)
         else:
-            vert_offset = 0
-
-        for u in range(self.resolution*self.turns+1):
-            for v in range(self.cross_segments):
-                vertices.append(cross_transform[u]*cross_vertices[v]+spiral_vertices[u])
-                if u < self.resolution*self.turns:
-                    faces.append([u*self.cross_segments+v+vert_offset,
-                                  (u+1)*self.cross_segments+v+vert_offset,
-                                  (u+1)*self.cross_segments+(v+1)%self.cross_segments+vert_offset,
-                                  u*self.cross_segments+(v+1)%self.cross_segments+vert_offset])
-
-        if self.cap_fill == "cap.ngon":
-            faces.insert(0, range(self.cross_segments))
-            faces.append(range((self.resolution*self.turns+1)*self.cross_segments-1,
-                                self.resolution*self.turns*self.cross_segments-1,
-                                -1))
-        elif self.cap_fill == "cap.fan":
-            vertices.insert(0, spiral_vertices[0])
-            vertices.append(spiral_vertices[self.resolution*self.turns])
-            start_cap = []
-            end_cap = []
-            for v in range(self.cross_segments):
-                start_cap.append([0,
-                                  v+1,
-                                  (v+1)%self.cross_segments+1])
-                end_cap.append([(self.resolution*self.turns+1)*self.cross_segments+1,
-                                (self.resolution*self.turns+1)*self.cross_segments-v,
-                                (self.resolution*self.turns+1)*self.cross_segments-(v+1)%self.cross_segments])
-            faces = start_cap+faces+end_cap
+            levels = [getSpiralGeometry(surface=surface, **arguments)]
 
         bpy.ops.object.select_all(action="DESELECT")
 
-        log_spiral_mesh = bpy.data.meshes.new("Logarithmic Spiral")
-        log_spiral_mesh.from_pydata(vertices, [], faces)
-        log_spiral_mesh.update()
-        log_spiral_object = bpy.data.objects.new("Logarithmic Spiral", log_spiral_mesh)
-        context.scene.objects.link(log_spiral_object)
-        log_spiral_object.select = True
-        bpy.context.scene.objects.active = log_spiral_object
+        #Create the mesh of each level once, and the objects of each copy sharing them.
+        #Select the top objects and make the first one active.
+        meshes = []
+        for level, geometry in enumerate(levels):
+            vertices, loops, loop_totals = geometry[:3]
+            normals, uvs = geometry[3:] if len(geometry) > 3 else (None, None)
+            log_spiral_mesh = bpy.data.meshes.new("Logarithmic Spiral LOD{}".format(level) if lod_factors else "Logarithmic Spiral")
+            with Profiling.stage("mesh.upload"):
+                fillMesh(log_spiral_mesh, vertices, loops, loop_totals,
+                         normals if self.use_normals else None, uvs if self.use_uvs else None)
+            meshes.append(log_spiral_mesh)
+        with Profiling.stage("object.link"):
+            locations = getArrayLocations(self.array_count, self.array_pattern, self.array_spacing, self.array_seed)
+            top_objects = createShapeObjects(context, "Logarithmic Spiral", "log_spiral", parameters,
+                                             meshes, lod_factors, locations.tolist())
+            for top_object in top_objects:
+                top_object.select = True
+            bpy.context.scene.objects.active = top_objects[0]
 
         return {"FINISHED"}
\ No newline at end of file
@@ -0,0 +1,104 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import numpy
+
+#Name of the UV map holding the texture coordinates made by the generators
+UV_LAYER_NAME = "UVMap"
+
+#Set the normals and texture coordinates made by the generators on a filled mesh, so that Blender
+#neither has to guess the shading nor needs an unwrap. normals holds a normal for each loop or
+#for each vertex, which become the custom split normals of the mesh, and uvs holds the texture
+#coordinates of each loop. Either can be None to leave that part of the mesh alone.
+def setSurface(mesh, normals=None, uvs=None):
+    if normals is not None:
+        normals = numpy.ascontiguousarray(normals, dtype=numpy.float32).reshape(-1, 3)
+        #Custom split normals are only used on smooth faces, with auto smooth enabled
+        mesh.polygons.foreach_set("use_smooth", numpy.ones(len(mesh.polygons), dtype=bool))
+        mesh.use_auto_smooth = True
+        if len(normals) == len(mesh.loops):
+            mesh.normals_split_custom_set(normals)
+        else:
+            mesh.normals_split_custom_set_from_vertices(normals)
+    if uvs is not None:
+        if UV_LAYER_NAME not in mesh.uv_layers:
+            mesh.uv_textures.new(UV_LAYER_NAME)
+        mesh.uv_layers[UV_LAYER_NAME].data.foreach_set("uv", numpy.ascontiguousarray(uvs, dtype=numpy.float32).reshape(-1))
+
+#Flat, contiguous buffers of the vertex coordinates, loop vertex indices, loop starts and loop totals of
+#the arguments of fillMesh
+def getMeshBuffers(vertices, faces, loop_totals=None):
+    vertices = numpy.ascontiguousarray(vertices, dtype=numpy.float32).reshape(-1)
+    loops = numpy.ascontiguousarray(faces, dtype=numpy.int32).reshape(-1)
+    if loop_totals is None:
+        faces = numpy.asarray(faces)
+        loop_totals = numpy.full(faces.shape[0], faces.shape[1], dtype=numpy.int32)
+    loop_totals = numpy.ascontiguousarray(loop_totals, dtype=numpy.int32)
+    loop_starts = numpy.zeros(len(loop_totals), dtype=numpy.int32)
+    numpy.cumsum(loop_totals[:-1], out=loop_starts[1:])
+    return vertices, loops, loop_starts, loop_totals
+
+#Write the buffers of getMeshBuffers to a mesh that already has as many vertices, loops and polygons,
+#and let Blender calculate the edges
+def setMeshBuffers(mesh, vertices, loops, loop_starts, loop_totals):
+    mesh.vertices.foreach_set("co", vertices)
+    mesh.loops.foreach_set("vertex_index", loops)
+    mesh.polygons.foreach_set("loop_start", loop_starts)
+    mesh.polygons.foreach_set("loop_total", loop_totals)
+    mesh.update(calc_edges=True)
+
+#Fill an empty mesh straight from flat, contiguous buffers instead of going through from_pydata.
+#faces is either an (F, n) array of polygons with n vertices each, or a flat array of loop vertex
+#indices, in which case loop_totals holds the number of vertices of each polygon.
+#normals and uvs are passed on to setSurface.
+def fillMesh(mesh, vertices, faces, loop_totals=None, normals=None, uvs=None):
+    vertices, loops, loop_starts, loop_totals = getMeshBuffers(vertices, faces, loop_totals)
+    mesh.vertices.add(len(vertices)//3)
+    mesh.loops.add(len(loops))
+    mesh.polygons.add(len(loop_totals))
+    setMeshBuffers(mesh, vertices, loops, loop_starts, loop_totals)
+    setSurface(mesh, normals, uvs)
+
+#Rebuild a mesh filled by fillMesh from new geometry, keeping the mesh datablock. If the faces are the same,
+#only the vertex coordinates are written. If only the counts of vertices, loops and polygons are the same,
+#the faces are written in place, and only if those change is the mesh emptied and filled again.
+#normals and uvs are passed on to setSurface. Returns whether the faces had to be rebuilt.
+def refillMesh(mesh, vertices, faces, loop_totals=None, normals=None, uvs=None):
+    vertices, loops, loop_starts, loop_totals = getMeshBuffers(vertices, faces, loop_totals)
+    if (len(mesh.vertices) != len(vertices)//3 or len(mesh.loops) != len(loops)
+            or len(mesh.polygons) != len(loop_totals)):
+        #Writing an empty BMesh to the mesh removes all its geometry, but keeps its materials and other settings
+        import bmesh
+        empty = bmesh.new()
+        empty.to_mesh(mesh)
+        empty.free()
+        fillMesh(mesh, vertices, loops, loop_totals, normals, uvs)
+        return True
+
+    current_loops = numpy.empty(len(loops), dtype=numpy.int32)
+    current_totals = numpy.empty(len(loop_totals), dtype=numpy.int32)
+    mesh.loops.foreach_get("vertex_index", current_loops)
+    mesh.polygons.foreach_get("loop_total", current_totals)
+    rebuilt = not (numpy.array_equal(current_loops, loops) and numpy.array_equal(current_totals, loop_totals))
+    if rebuilt:
+        setMeshBuffers(mesh, vertices, loops, loop_starts, loop_totals)
+    else:
+        mesh.vertices.foreach_set("co", vertices)
+        mesh.update()
+    setSurface(mesh, normals, uvs)
+    return rebuilt
@@ -0,0 +1,130 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+from bpy.types import Operator
+from .Geometry.Shapes import SHAPE_DEFAULTS
+
+#Custom properties the add operators store on each object they create, so that it can be regenerated later:
+#the name of the shape, its parameters as named in Geometry.Shapes.SHAPE_DEFAULTS, and, for the objects
+#of a level of detail group, the factor of their level. The empty of a group holds the parameters of all its levels.
+SHAPE_PROPERTY = "dd_shape"
+PARAMETERS_PROPERTY = "dd_shape_parameters"
+LOD_FACTOR_PROPERTY = "dd_shape_lod_factor"
+#Options of the add operators for the normals and UV map of the mesh, which are stored with the parameters
+#so that Regenerate rebuilds the same surface data, but aren't passed on to the geometry kernels
+SURFACE_OPTIONS = ("use_normals", "use_uvs")
+
+#Parameters of a shape as set on its add operator, including its surface options, with vector properties turned into lists
+def getOperatorParameters(operator, shape):
+    parameters = {}
+    for name in list(SHAPE_DEFAULTS[shape])+list(SURFACE_OPTIONS):
+        value = getattr(operator, name)
+        if not isinstance(value, (str, int, float)):
+            value = list(value)
+        parameters[name] = value
+    return parameters
+
+#Split parameters into those of the geometry kernel and the surface options, which are off if they're missing
+def splitSurfaceOptions(parameters):
+    parameters = dict(parameters)
+    options = {name: bool(parameters.pop(name, False)) for name in SURFACE_OPTIONS}
+    return parameters, options
+
+def storeShapeParameters(shape_object, shape, parameters, lod_factor=None):
+    shape_object[SHAPE_PROPERTY] = shape
+    shape_object[PARAMETERS_PROPERTY] = parameters
+    if lod_factor is not None:
+        shape_object[LOD_FACTOR_PROPERTY] = lod_factor
+
+#The shape, parameters and level of detail factor stored on an object, with the parameters as plain Python values
+def loadShapeParameters(shape_object):
+    parameters = shape_object[PARAMETERS_PROPERTY]
+    parameters = parameters.to_dict() if hasattr(parameters, "to_dict") else dict(parameters)
+    for name, value in parameters.items():
+        if hasattr(value, "to_list"):
+            parameters[name] = value.to_list()
+    return shape_object[SHAPE_PROPERTY], parameters, shape_object.get(LOD_FACTOR_PROPERTY)
+
+def isShapeObject(shape_object):
+    return shape_object is not None and SHAPE_PROPERTY in shape_object and PARAMETERS_PROPERTY in shape_object
+
+#The mesh objects to regenerate for the selected objects. Selecting the empty of a level of detail group
+#regenerates all its levels from the parameters of the empty, which are copied to the levels first.
+def getRegeneratedObjects(selected_objects):
+    regenerated = []
+    for selected in selected_objects:
+        if not isShapeObject(selected):
+            continue
+        if selected.type == "MESH":
+            regenerated.append(selected)
+            continue
+        shape, parameters, lod_factor = loadShapeParameters(selected)
+        for child in selected.children:
+            if child.type == "MESH" and isShapeObject(child):
+                storeShapeParameters(child, shape, parameters)
+                regenerated.append(child)
+    #Objects selected both on their own and through their group, or sharing their mesh
+    #with another selected object, are only regenerated once
+    unique = []
+    seen_meshes = set()
+    for regenerated_object in regenerated:
+        if regenerated_object.data not in seen_meshes:
+            seen_meshes.add(regenerated_object.data)
+            unique.append(regenerated_object)
+    return unique
+
+class OBJECT_OT_dd_shapes_regenerate(Operator):
+    bl_idname = "object.dd_shapes_regenerate"
+    bl_label = "Regenerate DD Shapes"
+    bl_description = "Rebuild the selected DD Shapes objects from the parameters in their custom properties, reusing their meshes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return any(isShapeObject(selected) for selected in context.selected_objects)
+
+    def execute(self, context):
+        from .Geometry import Profiling
+        from .Geometry.Shapes import generateShape
+        from .MeshBuilder import refillMesh
+
+        rebuilt = 0
+        failed = []
+        regenerated = getRegeneratedObjects(context.selected_objects)
+        for shape_object in regenerated:
+            shape, parameters, lod_factor = loadShapeParameters(shape_object)
+            parameters, options = splitSurfaceOptions(parameters)
+            #Objects with invalid parameters are reported and left as they are, the others are still regenerated
+            try:
+                geometry = generateShape(shape, parameters, lod_factor, options["use_normals"] or options["use_uvs"])
+            except (ValueError, TypeError) as error:
+                self.report({"ERROR"}, "{}: {}".format(shape_object.name, error))
+                failed.append(shape_object.name)
+                continue
+            vertices, loops, loop_totals = geometry[:3]
+            normals, uvs = geometry[3:] if len(geometry) > 3 else (None, None)
+            with Profiling.stage("mesh.refill"):
+                if refillMesh(shape_object.data, vertices, loops, loop_totals,
+                              normals if options["use_normals"] else None, uvs if options["use_uvs"] else None):
+                    rebuilt += 1
+        if failed:
+            self.report({"WARNING"}, "Failed to regenerate {} of {} objects: {}".format(len(failed), len(regenerated), ", ".join(failed)))
+            if len(failed) == len(regenerated):
+                return {"CANCELLED"}
+        self.report({"INFO"}, "Regenerated {} objects, {} with new topology".format(len(regenerated)-len(failed), rebuilt))
+        return {"FINISHED"}
@@ -0,0 +1,60 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+import bpy
+from .Regenerate import storeShapeParameters
+
+#Callbacks for enum properties
+#Array placement patterns, shared by the add operators
+def getArrayPatterns(self, context):
+    array_patterns = []
+    array_patterns.append(("array.grid",
+                           "Grid",
+                           "Place the copies row by row on a square grid"))
+    array_patterns.append(("array.ring",
+                           "Ring",
+                           "Place the copies evenly around a circle"))
+    array_patterns.append(("array.random",
+                           "Random",
+                           "Scatter the copies randomly, the same way for the same seed"))
+    return array_patterns
+
+#Create the objects of a shape at each of locations, all of them sharing meshes, which holds the mesh of each
+#level of detail. With levels of detail, each copy is an empty with an object for each level as its children.
+#Every object stores the parameters of the shape, so that it can be regenerated. Returns the top object of each copy.
+def createShapeObjects(context, name, shape, parameters, meshes, lod_factors, locations):
+    top_objects = []
+    for location in locations:
+        if lod_factors:
+            parent_object = bpy.data.objects.new(name, None)
+            parent_object.location = location
+            storeShapeParameters(parent_object, shape, parameters)
+            context.scene.objects.link(parent_object)
+            for level, mesh in enumerate(meshes):
+                level_object = bpy.data.objects.new("{} LOD{}".format(name, level), mesh)
+                level_object.parent = parent_object
+                storeShapeParameters(level_object, shape, parameters, lod_factors[level])
+                context.scene.objects.link(level_object)
+            top_objects.append(parent_object)
+        else:
+            shape_object = bpy.data.objects.new(name, meshes[0])
+            shape_object.location = location
+            storeShapeParameters(shape_object, shape, parameters)
+            context.scene.objects.link(shape_object)
+            top_objects.append(shape_object)
+    return top_objects
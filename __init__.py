@@ -23,14 +23,126 @@ bl_info = {
     "blender": (2, 79, 0),
     "location": "View3D > Add > Mesh",
     "description": "Add-ons for creating various mathematically generated shapes.",
-    "warning": "Some functionality depends on SciPy, however, this functionally is gracefully disabled if SciPy is unavailable.",
+    "warning": "",
     "wiki_url": "https://github.com/DuaneDibbley/DDShapes/wiki/DD-Shapes",
     "category": "Add Mesh"
 }
 
 import bpy
-from bpy.types import Menu, INFO_MT_mesh_add
-from . import EllipticTorus, LogSpiral
+from bpy.types import Menu, Operator, AddonPreferences, INFO_MT_mesh_add, VIEW3D_MT_object
+from bpy.props import IntProperty, BoolProperty, StringProperty, EnumProperty
+from . import EllipticTorus, LogSpiral, Regenerate
+from .Geometry.Caches import param_cache, disk_cache
+from .Geometry.DiskCache import defaultCacheDirectory
+from .Geometry import Backends, Profiling
+
+#Apply the add-on preferences to the parameterization caches, profiling, and solver backends.
+#None of these import NumPy, which is left to the first shape that is added.
+def configureCaches(preferences):
+    param_cache.setCapacity(preferences.param_cache_size)
+    disk_cache.enabled = preferences.use_disk_cache
+    disk_cache.directory = bpy.path.abspath(preferences.disk_cache_directory) or defaultCacheDirectory()
+    disk_cache.max_bytes = preferences.disk_cache_size*2**20
+    disk_cache.version = bl_info["version"]
+    if disk_cache.enabled:
+        disk_cache.evict()
+    Profiling.enabled = preferences.use_profiling
+    Backends.setPreferredBackend("tridiagonal", preferences.tridiagonal_backend)
+
+def updateCaches(self, context):
+    configureCaches(self)
+
+#Backends of the Equal Edge Length solver, only those whose packages can be found are listed
+def getTridiagonalBackends(self, context):
+    backends = [("automatic",
+                 "Automatic",
+                 "Use SciPy if another add-on has already imported it, NumPy otherwise")]
+    for backend in Backends.getBackends("tridiagonal"):
+        backends.append((backend.name,
+                         backend.label,
+                         "Solve the Equal Edge Length spacing with this library"))
+    return backends
+
+class DDShapesPreferences(AddonPreferences):
+    bl_idname = __name__
+
+    param_cache_size = IntProperty(name="Cached Ellipses",
+                                   description="Number of ellipse parameterizations kept in memory between operator redos",
+                                   default=64,
+                                   min=0,
+                                   max=4096,
+                                   update=updateCaches)
+    use_disk_cache = BoolProperty(name="Disk Cache",
+                                  description="Keep the solutions of the Equal Edge Length and Equal Arc Length spacings on disk across sessions",
+                                  default=False,
+                                  update=updateCaches)
+    disk_cache_directory = StringProperty(name="Cache Directory",
+                                          description="Where to keep the disk cache, leave empty for the default user cache directory",
+                                          default="",
+                                          subtype="DIR_PATH",
+                                          update=updateCaches)
+    disk_cache_size = IntProperty(name="Disk Cache Size (MiB)",
+                                  description="Remove the least recently used solutions when the disk cache grows beyond this size",
+                                  default=64,
+                                  min=1,
+                                  max=65536,
+                                  update=updateCaches)
+    tridiagonal_backend = EnumProperty(items=getTridiagonalBackends,
+                                       name="Edge Length Solver",
+                                       description="Library used to solve the Equal Edge Length spacing, loaded the first time it is needed",
+                                       update=updateCaches)
+    use_profiling = BoolProperty(name="Profiling",
+                                 description="Time the stages of each operator and report them in the info header",
+                                 default=False,
+                                 update=updateCaches)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "param_cache_size")
+        layout.prop(self, "use_disk_cache")
+        column = layout.column()
+        column.active = self.use_disk_cache
+        column.prop(self, "disk_cache_directory")
+        column.prop(self, "disk_cache_size")
+        layout.operator("wm.dd_shapes_clear_cache", icon="CANCEL")
+        layout.prop(self, "tridiagonal_backend")
+        row = layout.row()
+        row.prop(self, "use_profiling")
+        row.operator("wm.dd_shapes_dump_profile", icon="FILE_TEXT")
+
+class WM_OT_dd_shapes_clear_cache(Operator):
+    bl_idname = "wm.dd_shapes_clear_cache"
+    bl_label = "Clear Cache"
+    bl_description = "Remove all cached ellipse parameterizations, in memory and on disk"
+
+    def execute(self, context):
+        param_cache.clear()
+        disk_cache.clear()
+        self.report({"INFO"}, "DD Shapes cache cleared")
+        return {"FINISHED"}
+
+class WM_OT_dd_shapes_dump_profile(Operator):
+    bl_idname = "wm.dd_shapes_dump_profile"
+    bl_label = "Save Profile"
+    bl_description = "Save the stage timings and solver counters collected so far as JSON"
+
+    filepath = StringProperty(subtype="FILE_PATH")
+    reset = BoolProperty(name="Reset",
+                         description="Clear the collected timings after saving them",
+                         default=True)
+
+    def invoke(self, context, event):
+        if not self.filepath:
+            self.filepath = "dd_shapes_profile.json"
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+    def execute(self, context):
+        Profiling.dumpJSON(bpy.path.abspath(self.filepath))
+        if self.reset:
+            Profiling.reset()
+        self.report({"INFO"}, "DD Shapes profile saved to {}".format(self.filepath))
+        return {"FINISHED"}
 
 class INFO_MT_tori_add(Menu):
     bl_idname = "INFO_MT_tori_add"
@@ -38,6 +150,7 @@ class INFO_MT_tori_add(Menu):
 
     def draw(self, context):
         self.layout.operator("mesh.elliptic_torus_add", text="Elliptic Torus", icon="MESH_TORUS")
+        self.layout.operator("mesh.elliptic_torus_add_background", text="Elliptic Torus (Background)", icon="MESH_TORUS")
 
 class INFO_MT_spirals_add(Menu):
     bl_idname = "INFO_MT_spirals_add"
@@ -57,12 +170,18 @@ class INFO_MT_dd_shapes_menu(Menu):
 def menu_func(self, context):
     self.layout.menu("INFO_MT_dd_shapes_menu", text="DD Shapes", icon="MESH_DATA")
 
+def regenerate_menu_func(self, context):
+    self.layout.operator("object.dd_shapes_regenerate", icon="FILE_REFRESH")
+
 def register():
     bpy.types.INFO_MT_mesh_add.append(menu_func)
+    bpy.types.VIEW3D_MT_object.append(regenerate_menu_func)
     bpy.utils.register_module(__name__)
+    configureCaches(bpy.context.user_preferences.addons[__name__].preferences)
 
 def unregister():
     bpy.types.INFO_MT_mesh_add.remove(menu_func)
+    bpy.types.VIEW3D_MT_object.remove(regenerate_menu_func)
     bpy.utils.unregister_module(__name__)
 
 if __name__ == "__main__":
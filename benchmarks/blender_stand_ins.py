@@ -0,0 +1,184 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Minimal stand-ins for the parts of the Blender API the DD Shapes operators touch, so that their
+#execute methods, mesh upload included, can be benchmarked by a plain Python interpreter.
+#Properties evaluate to their default, and meshes copy what is handed to foreach_set into NumPy
+#arrays, which costs about what handing the buffers to Blender does.
+
+import importlib.util
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class StandInCollection:
+    def __init__(self):
+        self.count = 0
+        self.data = {}
+
+    def __len__(self):
+        return self.count
+
+    def add(self, count):
+        self.count += count
+
+    def foreach_set(self, attribute, values):
+        import numpy
+        self.data[attribute] = numpy.array(values)
+
+    def foreach_get(self, attribute, values):
+        values[:] = self.data[attribute]
+
+class StandInUVTextures:
+    def __init__(self, mesh):
+        self.mesh = mesh
+
+    def new(self, name="UVMap"):
+        self.mesh.uv_layers[name] = types.SimpleNamespace(name=name, data=StandInCollection())
+        return self.mesh.uv_layers[name]
+
+class StandInMesh:
+    def __init__(self, name):
+        self.name = name
+        self.vertices = StandInCollection()
+        self.loops = StandInCollection()
+        self.polygons = StandInCollection()
+        self.use_auto_smooth = False
+        self.has_custom_normals = False
+        self.uv_layers = {}
+        self.uv_textures = StandInUVTextures(self)
+
+    def update(self, calc_edges=False):
+        pass
+
+    def normals_split_custom_set(self, normals):
+        import numpy
+        self.custom_normals = numpy.array(normals)
+        self.has_custom_normals = True
+
+    def normals_split_custom_set_from_vertices(self, normals):
+        import numpy
+        self.custom_normals = numpy.array(normals)
+        self.has_custom_normals = True
+
+class StandInObject:
+    def __init__(self, name, data):
+        self.name = name
+        self.data = data
+        self.type = "EMPTY" if data is None else "MESH"
+        self.select = False
+        self.parent = None
+        self.children = []
+        self.properties = {}
+
+    #Custom properties
+    def __contains__(self, name):
+        return name in self.properties
+
+    def __getitem__(self, name):
+        return self.properties[name]
+
+    def __setitem__(self, name, value):
+        self.properties[name] = value
+
+    def get(self, name, default=None):
+        return self.properties.get(name, default)
+
+#An empty BMesh, which only empties the meshes it is written to
+class StandInBMesh:
+    def to_mesh(self, mesh):
+        mesh.vertices = StandInCollection()
+        mesh.loops = StandInCollection()
+        mesh.polygons = StandInCollection()
+        mesh.has_custom_normals = False
+        mesh.uv_layers.clear()
+
+    def free(self):
+        pass
+
+class StandInMeshes:
+    def __init__(self):
+        self.last = None
+
+    def new(self, name):
+        self.last = StandInMesh(name)
+        return self.last
+
+    def clear(self):
+        self.last = None
+
+class StandInObjects:
+    def new(self, name, data):
+        return StandInObject(name, data)
+
+class StandInSceneObjects:
+    def __init__(self):
+        self.active = None
+
+    def link(self, linked_object):
+        if linked_object.parent is not None:
+            linked_object.parent.children.append(linked_object)
+
+class StandInOperator:
+    def report(self, kind, message):
+        self.reports = getattr(self, "reports", [])+[message]
+
+def standInProperty(**keywords):
+    return keywords.get("default")
+
+#Register the stand-ins as the bpy module, unless the real one is already loaded
+def installStandIns():
+    if "bpy" in sys.modules:
+        return sys.modules["bpy"]
+    bpy = types.ModuleType("bpy")
+    bpy.types = types.ModuleType("bpy.types")
+    bpy.props = types.ModuleType("bpy.props")
+    for name in ("Operator", "AddonPreferences", "Menu", "INFO_MT_mesh_add", "VIEW3D_MT_object"):
+        setattr(bpy.types, name, type(name, (StandInOperator,), {}))
+    for name in ("IntProperty", "FloatProperty", "FloatVectorProperty", "EnumProperty", "StringProperty", "BoolProperty"):
+        setattr(bpy.props, name, standInProperty)
+    bpy.data = types.SimpleNamespace(meshes=StandInMeshes(), objects=StandInObjects())
+    bpy.ops = types.SimpleNamespace(object=types.SimpleNamespace(select_all=lambda action: None))
+    bpy.context = types.SimpleNamespace(scene=types.SimpleNamespace(objects=StandInSceneObjects()),
+                                        user_preferences=types.SimpleNamespace(addons={}))
+    bpy.path = types.SimpleNamespace(abspath=lambda path: path)
+    bpy.utils = types.SimpleNamespace(register_module=lambda module: None,
+                                      unregister_module=lambda module: None)
+    for menu in (bpy.types.INFO_MT_mesh_add, bpy.types.VIEW3D_MT_object):
+        menu.append = staticmethod(lambda draw: None)
+        menu.remove = staticmethod(lambda draw: None)
+    bmesh = types.ModuleType("bmesh")
+    bmesh.new = StandInBMesh
+    sys.modules["bmesh"] = bmesh
+    sys.modules["bpy"] = bpy
+    sys.modules["bpy.types"] = bpy.types
+    sys.modules["bpy.props"] = bpy.props
+    return bpy
+
+#Import the add-on as a package named DDShapes, whatever its directory is called
+def loadAddon():
+    installStandIns()
+    if "DDShapes" not in sys.modules:
+        spec = importlib.util.spec_from_file_location("DDShapes", os.path.join(ROOT, "__init__.py"),
+                                                      submodule_search_locations=[ROOT])
+        addon = importlib.util.module_from_spec(spec)
+        sys.modules["DDShapes"] = addon
+        spec.loader.exec_module(addon)
+    return sys.modules["DDShapes"]
@@ -0,0 +1,66 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Timing and accuracy of the "Equal Arc Length" spacing:
+#the Landen transformation engine against the per-step fsolve over quad it replaced.
+#Run from the repository root with:
+#    python benchmarks/equal_arc_length.py
+
+import os
+import sys
+import time
+import warnings
+from math import cos, sin, sqrt
+import numpy
+from scipy.integrate import quad
+from scipy.optimize import fsolve
+from scipy.special import hyp2f1
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Geometry.Ellipse import equalArcParams
+
+#Function to integrate to get the arc length
+def arcFunc(param, major, minor):
+    return sqrt((-major*sin(param))**2+(minor*cos(param))**2)
+
+#Integrate arcFunc (fsolve passes param as a one-element array)
+def arcLength(param, major, minor, arc_length):
+    return quad(arcFunc, a=0.0, b=float(param[0]), args=(major, minor))[0]-arc_length
+
+def legacyParams(major, minor, steps):
+    circumference = 2*numpy.pi*max(major, minor)*hyp2f1(-.5, .5, 1, 1-(min(major, minor)/max(major, minor))**2)
+    params = [0.0]
+    for step in range(1, steps):
+        params.append(fsolve(arcLength, [0.0], args=(major, minor, circumference*step/steps))[0])
+    return numpy.array(params)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter()-start
+
+warnings.simplefilter("ignore")
+print("{:>12} {:>6} {:>10} {:>10} {:>8} {:>14}".format("axes", "steps", "quad s", "landen s", "speedup", "max param diff"))
+for major, minor in ((2.618, 1.618), (5.0, 1.0), (10.0, 0.1)):
+    for steps in (48, 256, 1024):
+        legacy, legacy_time = timed(legacyParams, major, minor, steps)
+        params, table_time = timed(equalArcParams, major, minor, steps)
+        print("{:>12} {:>6} {:>10.4f} {:>10.4f} {:>7.0f}x {:>14.2e}".format("{:g}:{:g}".format(major, minor), steps,
+                                                                           legacy_time, table_time,
+                                                                           legacy_time/table_time,
+                                                                           numpy.abs(legacy-params).max()))
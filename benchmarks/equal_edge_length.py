@@ -0,0 +1,83 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Convergence and timing report for the "Equal Edge Length" spacing:
+#the tridiagonal Newton solver against the dense fsolve over distDiffs it replaced.
+#Run from the repository root with:
+#    python benchmarks/equal_edge_length.py [--legacy-max-steps N]
+
+import argparse
+import os
+import sys
+import time
+from math import cos, sin, sqrt, fabs
+import numpy
+from scipy.optimize import fsolve
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Geometry.Ellipse import chordLengths, equalChordParams
+
+#For a set of points on the ellipse, calculate the difference
+#lengths of its two connecting edges
+def distDiffs(params, major, minor):
+    steps = len(params)
+    diff_list = []
+    for step in range(steps):
+        x_coords = [major*cos(params[step]), major*cos(params[(step+1)%steps]), major*cos(params[(step+2)%steps])]
+        y_coords = [minor*sin(params[step]), minor*sin(params[(step+1)%steps]), minor*sin(params[(step+2)%steps])]
+        dist1 = sqrt((x_coords[0]-x_coords[1])**2+(y_coords[0]-y_coords[1])**2)
+        dist2 = sqrt((x_coords[2]-x_coords[1])**2+(y_coords[2]-y_coords[1])**2)
+        diff_list.append(fabs(dist2-dist1))
+    return diff_list
+
+def legacyParams(major, minor, steps):
+    params, info, status, message = fsolve(distDiffs,
+                                           x0=2*numpy.pi*numpy.arange(steps)/steps,
+                                           args=(major, minor),
+                                           full_output=True)
+    return params, info["nfev"]
+
+#Relative spread of the edge lengths, 0 for a perfect solution
+def spread(params, major, minor):
+    lengths = chordLengths(numpy.sort(numpy.mod(params, 2*numpy.pi)), major, minor)[0]
+    return (lengths.max()-lengths.min())/lengths.mean()
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter()-start
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--legacy-max-steps", type=int, default=256,
+                    help="skip the fsolve path above this many segments (it scales cubically)")
+args = parser.parse_args()
+
+print("{:>8} {:>6} {:>12} {:>12} {:>8} {:>12} {:>12}".format("axes", "steps",
+                                                            "fsolve s", "fsolve err", "nfev",
+                                                            "banded s", "banded err"))
+for major, minor in ((2.618, 1.618), (5.0, 1.0), (10.0, 0.5)):
+    for steps in (12, 48, 128, 256, 512, 1024):
+        params, banded_time = timed(equalChordParams, major, minor, steps)
+        if steps <= args.legacy_max_steps:
+            (legacy, nfev), legacy_time = timed(legacyParams, major, minor, steps)
+            legacy_columns = "{:>12.4f} {:>12.2e} {:>8}".format(legacy_time, spread(legacy, major, minor), nfev)
+        else:
+            legacy_columns = "{:>12} {:>12} {:>8}".format("-", "-", "-")
+        print("{:>8} {:>6} {} {:>12.4f} {:>12.2e}".format("{:g}:{:g}".format(major, minor), steps,
+                                                         legacy_columns,
+                                                         banded_time, spread(params, major, minor)))
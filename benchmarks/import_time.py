@@ -0,0 +1,92 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Time it takes to import and register the add-on, against stand-ins of bpy, and which of the heavy
+#numeric packages that pulls in. Each measurement runs in a fresh interpreter, so nothing is imported
+#beforehand. "register" is what Blender startup pays for the add-on, "first torus" is the additional
+#time of adding the first Elliptic Torus, where the geometry and NumPy are now imported, and "eager"
+#is registration followed by importing the geometry and the SciPy solver straight away, as the add-on
+#used to. Run from the repository root with:
+#    python benchmarks/import_time.py [--repeat N]
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+HEAVY_PACKAGES = ("numpy", "scipy")
+
+def measureChild(mode):
+    start = time.perf_counter()
+    from blender_stand_ins import loadAddon
+    addon = loadAddon()
+    bpy = sys.modules["bpy"]
+    bpy.context.user_preferences.addons["DDShapes"] = type("Addon", (), {"preferences": addon.DDShapesPreferences()})
+    addon.register()
+    if mode == "eager":
+        import importlib
+        importlib.import_module("DDShapes.Geometry.Torus")
+        try:
+            import scipy.linalg
+        except ImportError:
+            pass
+    registered = time.perf_counter()
+    imported = [package for package in HEAVY_PACKAGES if package in sys.modules]
+
+    operator = addon.EllipticTorus.MESH_OT_elliptic_torus_add()
+    operator.ring_axes = (2.618, 1.618)
+    operator.vstep = 48
+    operator.ring_spacing_type = "spacing.dist"
+    operator.cross_axes = (0.618, 0.382)
+    operator.ustep = 12
+    operator.cross_spacing_type = "spacing.dist"
+    operator.cross_twist_type = "twist.linear"
+    operator.tube_thickness_method = "thickness.cross"
+    operator.execute(bpy.context)
+    finished = time.perf_counter()
+    print(json.dumps({"register": registered-start, "first torus": finished-registered, "imported": imported}))
+
+def measure(mode, repeat):
+    runs = []
+    for run in range(repeat):
+        output = subprocess.check_output([sys.executable, __file__, "--child", mode], universal_newlines=True)
+        runs.append(json.loads(output))
+    runs.sort(key=lambda run: run["register"])
+    return runs[len(runs)//2]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5, help="number of fresh interpreters per mode, the median is reported")
+    parser.add_argument("--child", choices=("lazy", "eager"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        measureChild(args.child)
+        return 0
+
+    print("{:<8} {:>12} {:>15}  {}".format("mode", "register ms", "first torus ms", "imported at registration"))
+    for mode in ("lazy", "eager"):
+        result = measure(mode, args.repeat)
+        print("{:<8} {:>12.1f} {:>15.1f}  {}".format(mode,
+                                                    1000*result["register"],
+                                                    1000*result["first torus"],
+                                                    ", ".join(result["imported"]) or "-"))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Compare uploading torus geometry with Mesh.from_pydata against MeshBuilder.fillMesh.
+#Needs Blender, run it with:
+#    blender --background --factory-startup --python benchmarks/mesh_upload.py
+
+import os
+import sys
+import time
+import tracemalloc
+import bpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Geometry.Shapes import getShapeArguments
+from Geometry.Torus import getTorusGeometry
+from MeshBuilder import fillMesh
+
+def fromPydata(mesh, vertices, faces):
+    mesh.from_pydata(vertices.tolist(), [], faces.tolist())
+    mesh.update(calc_edges=True)
+
+def measure(upload, vertices, faces):
+    mesh = bpy.data.meshes.new("Benchmark")
+    tracemalloc.start()
+    start = time.perf_counter()
+    upload(mesh, vertices, faces)
+    elapsed = time.perf_counter()-start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    bpy.data.meshes.remove(mesh)
+    return elapsed, peak
+
+print("{:>6} {:>6} {:>10} {:>12} {:>10} {:>12} {:>8}".format("vstep", "ustep",
+                                                            "pydata s", "pydata MiB",
+                                                            "fill s", "fill MiB",
+                                                            "speedup"))
+for vstep, ustep in ((48, 12), (256, 64), (512, 256), (1024, 512), (1024, 1024)):
+    vertices, faces = getTorusGeometry(**getShapeArguments("elliptic_torus", {"vstep": vstep, "ustep": ustep}))
+    pydata_time, pydata_peak = measure(fromPydata, vertices, faces)
+    fill_time, fill_peak = measure(fillMesh, vertices, faces)
+    print("{:>6} {:>6} {:>10.4f} {:>12.1f} {:>10.4f} {:>12.1f} {:>7.1f}x".format(vstep, ustep,
+                                                                              pydata_time, pydata_peak/2**20,
+                                                                              fill_time, fill_peak/2**20,
+                                                                              pydata_time/fill_time))
@@ -0,0 +1,195 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+
+#Benchmark suite for the DD Shapes operators, run outside of Blender against stand-ins of bpy.
+#Times the execute method of each operator, mesh upload included, for every spacing type, twist
+#type, thickness method and cap fill over a sweep of segment counts, and for the adaptive spacing
+#over a sweep of tolerances, and records the peak memory of each case. The parameterization and
+#topology caches are cleared before every run, so each case is measured cold. Run from the
+#repository root with:
+#    python benchmarks/suite.py --save baseline.json
+#and, after a change:
+#    python benchmarks/suite.py --compare baseline.json
+#which flags every case that got slower or bigger than the thresholds allow and exits with 1.
+
+import argparse
+import importlib
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+import numpy
+
+from blender_stand_ins import loadAddon
+
+SEGMENT_COUNTS = (16, 64, 256, 1024)
+
+SPACING_TYPES = ("spacing.area", "spacing.normal", "spacing.radius", "spacing.dist", "spacing.arc")
+#The adaptive spacing picks its own segment counts, so it is swept over tolerances instead
+ADAPTIVE_TOLERANCES = (1e-2, 1e-3, 1e-4, 1e-5)
+TWIST_TYPES = ("twist.linear", "twist.sine", "twist.sincn", "twist.sinc", "twist.curve")
+THICKNESS_METHODS = ("thickness.cross", "thickness.tube")
+CAP_FILL_TYPES = ("cap.none", "cap.ngon", "cap.fan")
+
+#The defaults of the add operators, with more cross-section segments for the spiral
+SHAPE_DEFAULTS = loadAddon().Geometry.Shapes.SHAPE_DEFAULTS
+TORUS_DEFAULTS = SHAPE_DEFAULTS["elliptic_torus"]
+SPIRAL_DEFAULTS = dict(SHAPE_DEFAULTS["log_spiral"], cross_segments=16)
+
+def torusCase(segments, **parameters):
+    arguments = dict(TORUS_DEFAULTS, vstep=segments, ustep=max(segments//4, 4))
+    arguments.update(parameters)
+    return ("torus", arguments)
+
+def spiralCase(segments, **parameters):
+    arguments = dict(SPIRAL_DEFAULTS, resolution=16, turns=max(segments//16, 1))
+    arguments.update(parameters)
+    return ("spiral", arguments)
+
+#Case name -> (shape, operator properties)
+def getCases(segment_counts):
+    cases = OrderedDict()
+    for segments in segment_counts:
+        for spacing_type in SPACING_TYPES:
+            cases["torus/{}/{}".format(spacing_type, segments)] = torusCase(segments,
+                                                                            ring_spacing_type=spacing_type,
+                                                                            cross_spacing_type=spacing_type)
+        for twist_type in TWIST_TYPES:
+            cases["torus/{}/{}".format(twist_type, segments)] = torusCase(segments,
+                                                                          cross_twist=3,
+                                                                          cross_twist_type=twist_type)
+        for thickness_method in THICKNESS_METHODS:
+            cases["torus/{}/{}".format(thickness_method, segments)] = torusCase(segments,
+                                                                                tube_thickness_method=thickness_method)
+        for cap_fill in CAP_FILL_TYPES:
+            cases["spiral/{}/{}".format(cap_fill, segments)] = spiralCase(segments, cap_fill=cap_fill)
+    for tolerance in ADAPTIVE_TOLERANCES:
+        cases["torus/spacing.adaptive/{:g}".format(tolerance)] = torusCase(4,
+                                                                          ring_spacing_type="spacing.adaptive",
+                                                                          cross_spacing_type="spacing.adaptive",
+                                                                          ring_tolerance=tolerance,
+                                                                          cross_tolerance=tolerance)
+    return cases
+
+def clearCaches(addon):
+    importlib.import_module("DDShapes.Geometry.Ellipse").param_cache.clear()
+    importlib.import_module("DDShapes.Geometry.Topology").topology_cache.clear()
+
+def runCase(addon, shape, arguments):
+    if shape == "torus":
+        operator = addon.EllipticTorus.MESH_OT_elliptic_torus_add()
+    else:
+        operator = addon.LogSpiral.MESH_OT_log_spiral_add()
+    for name, value in arguments.items():
+        setattr(operator, name, value)
+    clearCaches(addon)
+    start = time.perf_counter()
+    operator.execute(sys.modules["bpy"].context)
+    return time.perf_counter()-start
+
+#Best of repeat cold runs, then the peak memory of one more run under tracemalloc
+def measure(addon, shape, arguments, repeat):
+    seconds = min(runCase(addon, shape, arguments) for _ in range(repeat))
+    tracemalloc.start()
+    runCase(addon, shape, arguments)
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    mesh = sys.modules["bpy"].data.meshes.last
+    return OrderedDict((("seconds", seconds),
+                        ("peak_bytes", peak_bytes),
+                        ("vertices", len(mesh.vertices)),
+                        ("faces", len(mesh.polygons))))
+
+def getEnvironment():
+    return OrderedDict((("python", platform.python_version()),
+                        ("numpy", numpy.__version__),
+                        ("machine", platform.machine()),
+                        ("processor", platform.processor()),
+                        ("system", platform.system()),
+                        ("date", time.strftime("%Y-%m-%dT%H:%M:%S"))))
+
+#Names of the regressed measurements of a case, compared to its baseline entry
+def getRegressions(result, baseline, time_threshold, memory_threshold, min_seconds):
+    regressions = []
+    if (result["seconds"] > baseline["seconds"]*(1+time_threshold)
+        and result["seconds"]-baseline["seconds"] > min_seconds):
+        regressions.append("time")
+    if result["peak_bytes"] > baseline["peak_bytes"]*(1+memory_threshold):
+        regressions.append("memory")
+    return regressions
+
+def formatChange(value, baseline):
+    if baseline is None:
+        return ""
+    return "{:+.0%}".format(value/baseline-1) if baseline else ""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--save", metavar="PATH", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="flag regressions against a JSON baseline")
+    parser.add_argument("--filter", default="", help="only run the cases whose name contains this")
+    parser.add_argument("--max-segments", type=int, default=SEGMENT_COUNTS[-1],
+                        help="skip the segment counts above this")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs of each case")
+    parser.add_argument("--time-threshold", type=float, default=0.25,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="relative growth of the peak memory that counts as a regression")
+    parser.add_argument("--min-seconds", type=float, default=0.001,
+                        help="ignore slowdowns smaller than this, which are mostly noise")
+    args = parser.parse_args(argv)
+
+    addon = loadAddon()
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+
+    results = OrderedDict()
+    regressed = []
+    print("{:<32} {:>10} {:>8} {:>10} {:>8}  {}".format("case", "ms", "change", "peak MiB", "change", "flags"))
+    for name, (shape, arguments) in getCases([count for count in SEGMENT_COUNTS if count <= args.max_segments]).items():
+        if args.filter not in name:
+            continue
+        result = measure(addon, shape, arguments, args.repeat)
+        results[name] = result
+        reference = baseline.get(name)
+        flags = []
+        if reference is not None:
+            flags = getRegressions(result, reference, args.time_threshold, args.memory_threshold, args.min_seconds)
+            if flags:
+                regressed.append(name)
+        print("{:<32} {:>10.2f} {:>8} {:>10.2f} {:>8}  {}".format(name,
+                                                                 1000*result["seconds"],
+                                                                 formatChange(result["seconds"], reference and reference["seconds"]),
+                                                                 result["peak_bytes"]/2**20,
+                                                                 formatChange(result["peak_bytes"], reference and reference["peak_bytes"]),
+                                                                 " ".join(flags)))
+
+    if args.save:
+        with open(args.save, "w") as baseline_file:
+            json.dump(OrderedDict((("environment", getEnvironment()), ("results", results))), baseline_file, indent=2)
+    if args.compare:
+        print("{} of {} cases regressed".format(len(regressed), len(results)))
+        return 1 if regressed else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())